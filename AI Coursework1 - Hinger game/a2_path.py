@@ -10,112 +10,764 @@ Implements search algorithms (BFS, DFS, IDDFS, and A*) for Task 2.
 @date: 19/10/2025
 """
 
+from array import array
 from collections import deque
+import csv
 import heapq
-from a1_state import State
+from itertools import islice
+import json
+import random
+import statistics
+import time
+from a1_state import State, cell_typecode
+
+# --- Safety facts ---
+class SafetyFacts:
+    # Per-search memo of each node's hinger and region counts, keyed by fingerprint.
+    # Each fact is computed at most once per node and shared by every edge out of
+    # and into it. It also holds the search counters: edges counts the transitions
+    # tested and expanded the nodes whose successors were generated.
+
+    def __init__(self):
+        self.hinger_counts = {}
+        self.region_counts = {}
+        self.edges = 0
+        self.expanded = 0
+
+    def hingers(self, state):
+        key = state.fingerprint()
+        count = self.hinger_counts.get(key)
+        if count is None:
+            count = self.hinger_counts[key] = state.numHingers()
+        return count
+
+    def regions(self, state):
+        key = state.fingerprint()
+        count = self.region_counts.get(key)
+        if count is None:
+            count = self.region_counts[key] = state.numRegions()
+        return count
+
+    # True if state has a hinger, i.e. no safe transition can leave it
+    def blocked(self, state):
+        return self.hingers(state) > 0
+
+    # Same rule as is_safe_transition
+    def safe(self, current, next_state):
+        self.edges += 1
+        if self.hingers(current) > 0 or self.hingers(next_state) > 0:
+            return False
+        return self.regions(next_state) <= self.regions(current)
+
+    # Same rule for a move already made in place with state.apply: before is the
+    # region count of the (unblocked) state the move was made from
+    def safe_applied(self, state, before):
+        self.edges += 1
+        return self.hingers(state) == 0 and self.regions(state) <= before
+
+    # Same rule for a move taken back in place with state.undo: state is now the
+    # board the move was made from and after is the region count of the
+    # (unblocked) board it led to
+    def safe_undone(self, state, after):
+        self.edges += 1
+        return self.hingers(state) == 0 and after <= self.regions(state)
+
+    # Copy the counters into a caller's stats dict
+    def report(self, stats):
+        if stats is not None:
+            stats["safety_evals"] = len(self.hinger_counts) + len(self.region_counts)
+            stats["edges"] = self.edges
+            stats["expanded"] = self.expanded
+
+
+# --- Node store ---
+class NodeStore:
+    # Compact arena of search nodes shared by the searches. Node k's board is the
+    # flat run boards[k * cells:(k + 1) * cells] of an unsigned array, one byte per
+    # cell while every counter fits and widened (see cell_typecode) the first time
+    # one does not, and parents[k] is the index of the node it was reached from
+    # (-1 for the root). Frontiers only hold node indices, and a path of States is
+    # rebuilt once, when a goal is reached.
+
+    def __init__(self, like):
+        self.factory = type(like)
+        self.rows, self.cols = len(like.grid), len(like.grid[0])
+        self.cells = self.rows * self.cols
+        self.boards = array(cell_typecode(max((cell for row in like.grid for cell in row), default=0)))
+        self.parents = array('i')
+
+    def __len__(self):
+        return len(self.parents)
+
+    # Append a node and return its index
+    def add(self, state, parent=-1):
+        start = len(self.boards)
+        try:
+            for row in state.grid:
+                self.boards.extend(row)
+        except OverflowError:
+            del self.boards[start:]
+            self.boards = array(cell_typecode(max(max(row) for row in state.grid)), self.boards)
+            for row in state.grid:
+                self.boards.extend(row)
+        self.parents.append(parent)
+        return len(self.parents) - 1
+
+    # Decode node k back into a State of the same class as the search input
+    def state(self, k):
+        flat = self.boards[k * self.cells:(k + 1) * self.cells]
+        return self.factory([flat[i * self.cols:(i + 1) * self.cols].tolist() for i in range(self.rows)])
+
+    # States from the root to node k
+    def path(self, k):
+        path = []
+        while k != -1:
+            path.append(self.state(k))
+            k = self.parents[k]
+        path.reverse()
+        return path
+
+
+# States visited by making moves from start one after another
+def replay(start, moves):
+    path = [start]
+    for move in moves:
+        state = path[-1].clone()
+        state.apply(move)
+        path.append(state)
+    return path
+
 
 # --- (BFS) ---
-def path_BFS(start, end):
-    visited = set()
-    queue = deque([(start, [start])])
+# Visited sets and index maps are keyed by the 64-bit Zobrist hash of each state.
+# Successors are tried in place (apply, test, undo) and only written to the node
+# store when they are enqueued, so rejected moves never allocate a board.
+def path_BFS(start, end, stats=None, bidirectional=False):
+    if bidirectional:
+        return _bidirectional_BFS(start, end, stats)
+    store = NodeStore(start)
+    visited = {start.zobrist}
+    queue = deque([store.add(start)])
+    facts = SafetyFacts()
 
-    while queue:
-        state, path = queue.popleft()
-        if state.grid == end.grid:
-            return path
-        visited.add(str(state.grid))
-        for move in state.moves():
-            if str(move.grid) not in visited and is_safe_transition(state, move):
-                queue.append((move, path + [move]))
-    return None
+    try:
+        while queue:
+            node = queue.popleft()
+            state = store.state(node)
+            if state == end:
+                return store.path(node)
+            if facts.blocked(state):
+                continue
+            facts.expanded += 1
+            before = facts.regions(state)
+            for move in state.legal_moves():
+                state.apply(move)
+                if state.zobrist not in visited and facts.safe_applied(state, before):
+                    visited.add(state.zobrist)
+                    queue.append(store.add(state, node))
+                state.undo(move)
+        return None
+    finally:
+        facts.report(stats)
+        if stats is not None:
+            stats["stored"] = len(store)
+
+
+# States one safe move before state: put back a counter on any cell still below
+# its value in start (states outside that bound cannot be reached from start).
+# Each counter is put back in place with undo and only safe predecessors are
+# copied; state is restored before every yield.
+def _predecessors(state, start, facts):
+    if facts.blocked(state):
+        return
+    after = facts.regions(state)
+    for i, row in enumerate(start.grid):
+        for j, limit in enumerate(row):
+            if state.grid[i][j] < limit:
+                state.undo((i, j))
+                prev = state.clone() if facts.safe_undone(state, after) else None
+                state.apply((i, j))
+                if prev is not None:
+                    yield prev
+
+
+# Bidirectional BFS: grow layers from start (moves) and from end (predecessors),
+# always expanding the smaller frontier, until the two searches meet.
+# Every move removes one counter, so all safe paths have the same length and the
+# first meeting point already gives a shortest path.
+def _bidirectional_BFS(start, end, stats=None):
+    facts = SafetyFacts()
+    forward, backward = NodeStore(start), NodeStore(end)
+    # hash -> node index in each store
+    forward_seen = {start.zobrist: forward.add(start)}
+    backward_seen = {end.zobrist: backward.add(end)}
+    forward_layer, backward_layer = [0], [0]
+    expanded = {"forward": 0, "backward": 0}
+    meet = start.zobrist if start == end else None
+
+    try:
+        while meet is None and forward_layer and backward_layer:
+            next_layer = []
+            if len(forward_layer) <= len(backward_layer):
+                for node in forward_layer:
+                    state = forward.state(node)
+                    if facts.blocked(state):
+                        continue
+                    expanded["forward"] += 1
+                    before = facts.regions(state)
+                    for move in state.legal_moves():
+                        state.apply(move)
+                        key = state.zobrist
+                        if key not in forward_seen and facts.safe_applied(state, before):
+                            forward_seen[key] = forward.add(state, node)
+                            if key in backward_seen:
+                                meet = key
+                            else:
+                                next_layer.append(forward_seen[key])
+                        state.undo(move)
+                        if meet is not None:
+                            break
+                    if meet is not None:
+                        break
+                forward_layer = next_layer
+            else:
+                for node in backward_layer:
+                    state = backward.state(node)
+                    expanded["backward"] += 1
+                    for prev in _predecessors(state, start, facts):
+                        if prev.zobrist not in backward_seen:
+                            backward_seen[prev.zobrist] = backward.add(prev, node)
+                            if prev.zobrist in forward_seen:
+                                meet = prev.zobrist
+                                break
+                            next_layer.append(backward_seen[prev.zobrist])
+                    if meet is not None:
+                        break
+                backward_layer = next_layer
+
+        if meet is None:
+            return None
+        # start ... meet, then the backward chain meet ... end without repeating meet
+        tail = backward.path(backward_seen[meet])
+        tail.reverse()
+        return forward.path(forward_seen[meet]) + tail[1:]
+    finally:
+        facts.expanded = expanded["forward"] + expanded["backward"]
+        facts.report(stats)
+        if stats is not None:
+            stats["expanded_forward"] = expanded["forward"]
+            stats["expanded_backward"] = expanded["backward"]
+            stats["stored"] = len(forward) + len(backward)
 
 
 # --- (DFS) ---
-def path_DFS(start, end):
+def path_DFS(start, end, stats=None):
+    store = NodeStore(start)
     visited = set()
-    stack = [(start, [start])]
+    stack = [store.add(start)]
+    facts = SafetyFacts()
 
-    while stack:
-        state, path = stack.pop()
-        if state.grid == end.grid:
-            return path
-        visited.add(str(state.grid))
-        for move in state.moves():
-            if str(move.grid) not in visited and is_safe_transition(state, move):
-                stack.append((move, path + [move]))
-    return None
+    try:
+        while stack:
+            node = stack.pop()
+            state = store.state(node)
+            if state == end:
+                return store.path(node)
+            visited.add(state.zobrist)
+            if facts.blocked(state):
+                continue
+            facts.expanded += 1
+            before = facts.regions(state)
+            for move in state.legal_moves():
+                state.apply(move)
+                if state.zobrist not in visited and facts.safe_applied(state, before):
+                    stack.append(store.add(state, node))
+                state.undo(move)
+        return None
+    finally:
+        facts.report(stats)
+        if stats is not None:
+            stats["stored"] = len(store)
 
 
 # --- (ID-DFS) ---
-def path_IDDFS(start, end, max_depth=10):
-    def dfs_limit(state, end, path, depth, visited):
-        if depth == 0:
-            return None
-        if state.grid == end.grid:
-            return path
-        visited.add(str(state.grid))
-        for move in state.moves():
-            if str(move.grid) not in visited and is_safe_transition(state, move):
-                result = dfs_limit(move, end, path + [move], depth - 1, visited)
-                if result:
-                    return result
+# Depth-limited DFS with growing limits; max_depth counts the states on the path.
+# Moves only remove counters, so no path can revisit a state and no visited set is
+# needed. Instead a depth-aware transposition table remembers, for every state that
+# failed, the most moves it was searched with: reaching it again with that many
+# moves left or fewer cannot succeed. The table survives between limits and is
+# capped at table_size entries. The search walks one board with apply/undo and
+# keeps the moves made (append on the way down, pop on the way back); the path of
+# States is only built once end is found.
+def path_IDDFS(start, end, max_depth=10, stats=None, table_size=100000):
+    facts = SafetyFacts()
+    state = start.clone()
+    moves = []
+    failed = {}  # hash -> moves left when the state was searched and failed
+    hits = 0
+
+    def dfs_limit(moves_left):
+        nonlocal hits
+        if state == end:
+            return True
+        if moves_left == 0:
+            return False
+        if failed.get(state.zobrist, -1) >= moves_left:
+            hits += 1
+            return False
+        if not facts.blocked(state):
+            facts.expanded += 1
+            before = facts.regions(state)
+            for move in state.legal_moves():
+                state.apply(move)
+                if facts.safe_applied(state, before):
+                    moves.append(move)
+                    if dfs_limit(moves_left - 1):
+                        return True
+                    moves.pop()
+                state.undo(move)
+        if state.zobrist in failed or len(failed) < table_size:
+            failed[state.zobrist] = moves_left
+        return False
+
+    try:
+        for limit in range(max_depth):
+            if dfs_limit(limit):
+                return replay(start, moves)
         return None
+    finally:
+        facts.report(stats)
+        if stats is not None:
+            stats["table_hits"] = hits
+            stats["table_size"] = len(failed)
+
+
+# Number of counters left on the board (kept up to date by the State itself)
+def counters(state):
+    return state.total
 
-    for limit in range(1, max_depth + 1):
-        result = dfs_limit(start, end, [start], limit, set())
-        if result:
-            return result
-    return None
+
+# Moves only remove counters, so end is unreachable once any cell has fewer than in end
+def can_reach(state, end):
+    return all(a >= b for row, end_row in zip(state.grid, end.grid) for a, b in zip(row, end_row))
 
 
 # --- A* Search ---
-def path_astar(start, end):
-    def heuristic(s1, s2):
-        diff = 0
-        for i in range(len(s1.grid)):
-            for j in range(len(s1.grid[0])):
-                if s1.grid[i][j] != s2.grid[i][j]:
-                    diff += 1
-        return diff
+# Every move removes exactly one counter, so counters(state) - counters(end) is the
+# exact number of moves left whenever end is reachable at all. The heuristic is
+# therefore admissible and consistent (it drops by exactly 1 per move), states that
+# can no longer reach end are pruned, and a closed set is safe. Ties on f go to the
+# deepest node, so a solvable query expands close to the path length in nodes.
+# weight > 1 gives weighted A* (f = g + weight * h), which dives towards end more
+# greedily; deadline is a time.perf_counter() value after which the search gives
+# up and returns None with stats["timed_out"] set.
+def path_astar(start, end, stats=None, weight=1, deadline=None):
+    end_counters = counters(end)
+
+    def heuristic(state):
+        return counters(state) - end_counters
 
+    store = NodeStore(start)
     open_set = []
-    g_score = {str(start.grid): 0}
+    g_score = {start.zobrist: 0}
+    closed = set()
     counter = 0  # tie-breaker
-    heapq.heappush(open_set, (0, counter, start, [start]))
-
-    while open_set:
-        _, _, current, path = heapq.heappop(open_set)
-        if current.grid == end.grid:
-            return path
-
-        for move in current.moves():
-            if is_safe_transition(current, move):
-                cost = g_score[str(current.grid)] + 1
-                if str(move.grid) not in g_score or cost < g_score[str(move.grid)]:
-                    g_score[str(move.grid)] = cost
-                    f = cost + heuristic(move, end)
+    facts = SafetyFacts()
+    pruned = 0
+    if can_reach(start, end):
+        heapq.heappush(open_set, (weight * heuristic(start), 0, counter, store.add(start)))
+    timed_out = False
+
+    try:
+        while open_set:
+            if deadline is not None and time.perf_counter() > deadline:
+                timed_out = True
+                return None
+            _, _, _, node = heapq.heappop(open_set)
+            current = store.state(node)
+            if current == end:
+                return store.path(node)
+            if current.zobrist in closed:
+                continue
+            closed.add(current.zobrist)
+            if facts.blocked(current):
+                continue
+            facts.expanded += 1
+            cost = g_score[current.zobrist] + 1
+            before = facts.regions(current)
+
+            for move in current.legal_moves():
+                current.apply(move)
+                key = current.zobrist
+                if key in closed:
+                    pass
+                elif not can_reach(current, end):
+                    pruned += 1
+                elif facts.safe_applied(current, before) and (key not in g_score or cost < g_score[key]):
+                    g_score[key] = cost
                     counter += 1
-                    heapq.heappush(open_set, (f, counter, move, path + [move]))
-    return None
+                    heapq.heappush(open_set, (cost + weight * heuristic(current), -cost, counter, store.add(current, node)))
+                current.undo(move)
+        return None
+    finally:
+        facts.report(stats)
+        if stats is not None:
+            stats["pruned"] = pruned
+            stats["stored"] = len(store)
+            stats["timed_out"] = timed_out
+
 
+# --- Beam Search ---
+# Breadth-first, but only the `width` best successors of each layer are kept.
+# All states in a layer have the same number of counters, so they are ranked by
+# how many cells still differ from end (fewest first). Fast and memory-bounded,
+# but incomplete: it returns None if every kept state runs into a dead end.
+def path_beam(start, end, width=100, stats=None):
+    def mismatched(state):
+        return sum(a != b for row, end_row in zip(state.grid, end.grid) for a, b in zip(row, end_row))
+
+    store = NodeStore(start)
+    facts = SafetyFacts()
+    layer = [store.add(start)] if can_reach(start, end) else []
+
+    try:
+        while layer:
+            candidates = {}  # hash -> (rank, node)
+            for node in layer:
+                state = store.state(node)
+                if state == end:
+                    return store.path(node)
+                if facts.blocked(state):
+                    continue
+                facts.expanded += 1
+                before = facts.regions(state)
+                for move in state.legal_moves():
+                    state.apply(move)
+                    if state.zobrist not in candidates and can_reach(state, end) \
+                            and facts.safe_applied(state, before):
+                        if state == end:
+                            return store.path(store.add(state, node))
+                        candidates[state.zobrist] = (mismatched(state), store.add(state, node))
+                    state.undo(move)
+            layer = [node for _, node in heapq.nsmallest(width, candidates.values())]
+        return None
+    finally:
+        facts.report(stats)
+        if stats is not None:
+            stats["stored"] = len(store)
+
+
+# --- Anytime Search ---
+# Weighted A* with falling weights (the greediest first, for a quick first path)
+# until time_limit seconds have passed or the path is proven optimal. The bound on
+# suboptimality is (moves in the best path) / (counters(start) - counters(end)),
+# the admissible A* lower bound. Every move removes exactly one counter, so any
+# safe path to end already meets that bound: the first path found has bound 1.0
+# and the loop stops there. Later weights only run while no path is known.
+# stats gets the summed search counters, "bound" and "improvements", a list of
+# (seconds, moves, bound).
+def path_anytime(start, end, time_limit=1.0, weights=(5, 2, 1), stats=None):
+    started = time.perf_counter()
+    deadline = started + time_limit
+    lower = counters(start) - counters(end)
+    best, bound = None, float('inf')
+    improvements = []
+    totals = {"safety_evals": 0, "edges": 0, "expanded": 0}
+
+    def offer(path, run):
+        nonlocal best, bound
+        for key in totals:
+            totals[key] += run[key]
+        if path is not None and (best is None or len(path) < len(best)):
+            best = path
+            bound = (len(path) - 1) / lower if lower > 0 else 1.0
+            improvements.append((time.perf_counter() - started, len(path) - 1, bound))
+
+    for weight in weights:
+        if bound <= 1 or time.perf_counter() > deadline:
+            break
+        run = {}
+        offer(path_astar(start, end, run, weight=weight, deadline=deadline), run)
+        if best is None and not run["timed_out"]:
+            break  # A* searched everything: end cannot be reached
+    if stats is not None:
+        stats.update(totals)
+        stats["bound"] = bound
+        stats["improvements"] = improvements
+    return best
+
+
+# --- IDA* Search ---
+# Iterative deepening on f = g + (counters(state) - counters(end)): each pass is a
+# depth-first search cut off at the current f bound, and the next bound is the
+# smallest f that was cut off. Memory is one board moved around with apply/undo
+# plus the moves made. Because the heuristic is exact whenever end is reachable,
+# the first bound is normally the answer and the search then only pays for dead
+# ends under it.
+def path_idastar(start, end, stats=None):
+    end_counters = counters(end)
+    facts = SafetyFacts()
+    state = start.clone()
+    moves = []
+    found = -1  # sentinel returned up the recursion once end is reached
+    iterations = 0
+
+    def search(g, bound):
+        f = g + counters(state) - end_counters
+        if f > bound:
+            return f
+        if state == end:
+            return found
+        if facts.blocked(state):
+            return float('inf')
+        facts.expanded += 1
+        next_bound = float('inf')
+        before = facts.regions(state)
+        for move in state.legal_moves():
+            state.apply(move)
+            if can_reach(state, end) and facts.safe_applied(state, before):
+                moves.append(move)
+                t = search(g + 1, bound)
+                if t == found:
+                    return found
+                next_bound = min(next_bound, t)
+                moves.pop()
+            state.undo(move)
+        return next_bound
+
+    try:
+        if not can_reach(start, end):
+            return None
+        bound = counters(start) - end_counters
+        while True:
+            iterations += 1
+            t = search(0, bound)
+            if t == found:
+                return replay(start, moves)
+            if t == float('inf'):
+                return None
+            bound = t
+    finally:
+        facts.report(stats)
+        if stats is not None:
+            stats["iterations"] = iterations
+
+
+# --- Path Generators ---
+# Lazy depth-first enumeration of safe paths with exactly `length` states (ending
+# at end when it is given). Memory is the current path, one successor iterator
+# per level and a capped set of dead states (hashes of states that led nowhere
+# this pass). Safety checks go through a private SafetyFacts memo, dropped once
+# its hinger and region entries together outgrow dead_limit.
+def _paths_of_length(start, end, length, dead_limit):
+    if length == 1:
+        if end is None or start == end:
+            yield [start]
+        return
+
+    # Successors are tested in place and only the safe ones copied. The safety
+    # memo (hinger and region counts together) is dropped whenever it outgrows
+    # dead_limit, so memory stays bounded.
+    def children(state):
+        nonlocal facts
+        if len(facts.hinger_counts) + len(facts.region_counts) > dead_limit:
+            facts = SafetyFacts()
+        if facts.blocked(state):
+            return
+        before = facts.regions(state)
+        for move in state.legal_moves():
+            state.apply(move)
+            child = None
+            if state.zobrist not in dead and (end is None or can_reach(state, end)) \
+                    and facts.safe_applied(state, before):
+                child = state.clone()
+            state.undo(move)
+            if child is not None:
+                yield child
+
+    facts = SafetyFacts()
+    dead = set()
+    path = [start]
+    stack = [[children(start), False]]  # successor iterator, whether a path was found below
+    while stack:
+        frame = stack[-1]
+        child = next(frame[0], None)
+        if child is None:
+            stack.pop()
+            state = path.pop()
+            if not frame[1] and len(dead) < dead_limit:
+                dead.add(state.zobrist)
+            if stack and frame[1]:
+                stack[-1][1] = True
+            continue
+        if len(path) + 1 == length:
+            if end is None or child == end:
+                frame[1] = True
+                yield path + [child]
+            continue
+        path.append(child)
+        stack.append([children(child), False])
+
+
+# Yield safe paths from start lazily, shortest first. With an end state every
+# move removes exactly one counter, so all paths have the same length
+# (counters(start) - counters(end) + 1 states) and the enumeration order is
+# already non-decreasing; Yen-style re-ranking would add nothing. Without an end
+# state it yields every safe path from start, length by length up to max_length.
+# Stop iterating at any point and no further work is done.
+def iter_safe_paths(start, end=None, max_length=None, dead_limit=100000):
+    if end is not None:
+        length = counters(start) - counters(end) + 1
+        if can_reach(start, end) and (max_length is None or length <= max_length):
+            yield from _paths_of_length(start, end, length, dead_limit)
+        return
+    limit = counters(start) + 1 if max_length is None else min(max_length, counters(start) + 1)
+    for length in range(1, limit + 1):
+        yield from _paths_of_length(start, None, length, dead_limit)
+
+
+# The first k safe paths from start to end (all of them have the minimum length)
+def k_shortest_paths(start, end, k):
+    return list(islice(iter_safe_paths(start, end), k))
 
 
 # --- Compare Algorithms ---
+def _path_BiBFS(start, end, stats=None):
+    return path_BFS(start, end, stats, bidirectional=True)
+
+
+# Algorithms run by compare() and benchmark(), by name
+ALGORITHMS = {"BFS": path_BFS, "BiBFS": _path_BiBFS, "DFS": path_DFS, "IDDFS": path_IDDFS,
+              "A*": path_astar, "IDA*": path_idastar, "Beam": path_beam, "Anytime": path_anytime}
+
+
 def compare(start, end):
-    import time
-    algos = [("BFS", path_BFS), ("DFS", path_DFS), ("IDDFS", path_IDDFS), ("A*", path_astar)]
-    for name, func in algos:
-        start_time = time.time()
-        result = func(start, end)
-        duration = time.time() - start_time
-        print(f"{name:6} | Found: {result is not None} | Steps: {len(result) if result else 0} | Time: {duration:.4f}s")
+    for name, func in ALGORITHMS.items():
+        stats = {}
+        start_time = time.perf_counter()
+        result = func(start, end, stats=stats)
+        duration = time.perf_counter() - start_time
+        print(f"{name:7} | Found: {result is not None} | Steps: {len(result) if result else 0} | Time: {duration:.4f}s"
+              f" | Safety evals: {stats['safety_evals']} for {stats['edges']} edges"
+              f" | Expanded: {stats.get('expanded', '-')}")
+
+
+# --- Benchmark ---
+# Seeded start/end pair: a random board, and the state reached from it by a random
+# walk of up to `steps` safe moves (so end is always reachable)
+def random_pair(rows, cols, steps, seed):
+    rng = random.Random(seed)
+    while True:
+        start = State([[rng.choice([0, 1, 2, 2, 3]) for _ in range(cols)] for _ in range(rows)])
+        if start.numHingers() == 0:
+            break
+    end = start
+    facts = SafetyFacts()
+    for _ in range(steps):
+        if facts.blocked(end):
+            break
+        before = facts.regions(end)
+        options = []
+        for move in end.legal_moves():
+            end.apply(move)
+            if facts.safe_applied(end, before):
+                options.append(move)
+            end.undo(move)
+        if not options:
+            break
+        end = end.clone()
+        end.apply(rng.choice(options))
+    return start, end
+
+
+# One benchmark run in a worker process: time the search with perf_counter, then
+# (optionally) repeat it under tracemalloc for the peak memory
+def _benchmark_case(case):
+    import tracemalloc
+    name, rows, cols, steps, seed, measure_memory = case
+    start, end = random_pair(rows, cols, steps, seed)
+    stats = {}
+    start_time = time.perf_counter()
+    result = ALGORITHMS[name](start, end, stats=stats)
+    duration = time.perf_counter() - start_time
+    peak = None
+    if measure_memory:
+        tracemalloc.start()
+        ALGORITHMS[name](start, end)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"algorithm": name, "rows": rows, "cols": cols, "steps": steps, "seed": seed,
+            "found": result is not None, "length": len(result) if result else 0,
+            "time_s": duration, "expanded": stats.get("expanded"), "edges": stats.get("edges"),
+            "safety_evals": stats.get("safety_evals"), "stored": stats.get("stored"),
+            "peak_bytes": peak}
+
+
+# Mean / median / stdev of the time and node counts per (algorithm, board size)
+def summarise(runs):
+    groups = {}
+    for run in runs:
+        groups.setdefault((run["algorithm"], run["rows"], run["cols"]), []).append(run)
+    summary = []
+    for (name, rows, cols), group in groups.items():
+        times = [run["time_s"] for run in group]
+        expanded = [run["expanded"] for run in group if run["expanded"] is not None]
+        peaks = [run["peak_bytes"] for run in group if run["peak_bytes"] is not None]
+        summary.append({
+            "algorithm": name, "rows": rows, "cols": cols, "runs": len(group),
+            "found": sum(run["found"] for run in group),
+            "time_mean_s": statistics.mean(times), "time_median_s": statistics.median(times),
+            "time_stdev_s": statistics.stdev(times) if len(times) > 1 else 0.0,
+            "expanded_mean": statistics.mean(expanded) if expanded else None,
+            "peak_bytes_mean": statistics.mean(peaks) if peaks else None})
+    return summary
+
+
+# Run every algorithm over `pairs` seeded start/end pairs per board size in a process
+# pool, print a summary table and optionally write the runs to out (.csv or .json).
+# Returns (runs, summary).
+def benchmark(sizes=((3, 3), (3, 4)), pairs=5, steps=4, seed=0, algorithms=None,
+              processes=None, measure_memory=True, out=None):
+    from concurrent.futures import ProcessPoolExecutor
+    names = list(algorithms or ALGORITHMS)
+    cases = [(name, rows, cols, steps, seed * 1000003 + k, measure_memory)
+             for rows, cols in sizes for k in range(pairs) for name in names]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        runs = list(pool.map(_benchmark_case, cases, chunksize=max(1, len(cases) // 64)))
+    summary = summarise(runs)
+
+    for row in summary:
+        line = (f"{row['algorithm']:7} | {row['rows']}x{row['cols']} | Found: {row['found']}/{row['runs']}"
+                f" | Time mean {row['time_mean_s']:.4f}s median {row['time_median_s']:.4f}s"
+                f" sd {row['time_stdev_s']:.4f}s")
+        if row["expanded_mean"] is not None:
+            line += f" | Expanded: {row['expanded_mean']:.0f}"
+        if row["peak_bytes_mean"] is not None:
+            line += f" | Peak: {row['peak_bytes_mean'] / 1024:.0f} KiB"
+        print(line)
+
+    if out is not None:
+        if out.endswith(".csv"):
+            with open(out, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=list(runs[0]))
+                writer.writeheader()
+                writer.writerows(runs)
+        else:
+            with open(out, "w") as f:
+                json.dump({"runs": runs, "summary": summary}, f, indent=2)
+    return runs, summary
+
  
     
-def is_safe_transition(current, next_state):
-    """A safe transition avoids hingers and does not increase active regions."""
-    if current.numHingers() > 0 or next_state.numHingers() > 0:
+def is_safe_transition(current, next_state, cache=True):
+    """A safe transition avoids hingers and does not increase active regions.
+
+    cache is passed on to numHingers/numRegions: True uses the shared LRU
+    region_cache, False recomputes, or pass a RegionCache of your own.
+    """
+    if current.numHingers(cache) > 0 or next_state.numHingers(cache) > 0:
         return False
-    if next_state.numRegions() > current.numRegions():
+    if next_state.numRegions(cache) > current.numRegions(cache):
         return False
     return True
 
@@ -152,6 +804,9 @@ def tester():
     print("\n--- BFS ---")
     print_path(path_BFS(s1, s2))
 
+    print("\n--- Bidirectional BFS ---")
+    print_path(path_BFS(s1, s2, bidirectional=True))
+
     print("\n--- DFS ---")
     print_path(path_DFS(s1, s2))
 
@@ -161,6 +816,38 @@ def tester():
     print("\n--- A* ---")
     print_path(path_astar(s1, s2))
 
+    print("\n--- IDA* ---")
+    print_path(path_idastar(s1, s2))
+
+    print("\n--- Weighted A* (w = 3) ---")
+    print_path(path_astar(s1, s2, weight=3))
+
+    print("\n--- Beam Search (width 2) ---")
+    print_path(path_beam(s1, s2, width=2))
+
+    print("\n--- Anytime (0.5s) ---")
+    stats = {}
+    path = path_anytime(s1, s2, time_limit=0.5, stats=stats)
+    print("Moves:", len(path) - 1 if path else None, "| Bound:", stats["bound"],
+          "| Improvements:", [(moves, bound) for _, moves, bound in stats["improvements"]])
+
+    print("\n--- First 3 Safe Paths ---")
+    for k, path in enumerate(k_shortest_paths(s1, s2, 3), 1):
+        # the cell each step removes a counter from
+        cells = [next((i, j) for i in range(len(a.grid)) for j in range(len(a.grid[0])) if a.grid[i][j] != b.grid[i][j])
+                 for a, b in zip(path, path[1:])]
+        print(f"Path {k}: moves {cells}")
+    # a tiny dead_limit keeps dropping the memos but must not change the paths
+    assert list(islice(iter_safe_paths(s1, s2, dead_limit=2), 3)) == k_shortest_paths(s1, s2, 3)
+
+    print("\n--- Counters Above 255 ---")
+    big_start, big_end = State([[300, 0], [0, 1]]), State([[298, 0], [0, 1]])
+    for name, search in [("BFS", path_BFS), ("DFS", path_DFS), ("A*", path_astar), ("Beam", path_beam)]:
+        path = search(big_start, big_end)
+        assert path is not None and len(path) == 3 and path[-1] == big_end, name
+    assert len(path_BFS(big_start, big_end, bidirectional=True)) == 3
+    print("[OK] Node-store searches handle wide counters")
+
     print("\n--- Compare Algorithms ---")
     compare(s1, s2)
 
@@ -11,39 +11,158 @@ Implements decision-making strategies using minimax and alpha-beta pruning algor
 
 """
 
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import time
+
 from a1_state import State
 
 
+# Raised inside a search once the time budget of the move has run out
+class SearchTimeout(Exception):
+    pass
+
+
+# Raised inside a parallel worker's search once a better shared root score has
+# made its window stale
+class WindowRaised(Exception):
+    pass
+
+
+# Bound types of a stored score
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Half-width of the "pvs" mode's first root window around the guessed score
+# (scores are small integers)
+ASPIRATION_WINDOW = 1
+
+# Nodes a parallel worker searches between reads of the shared best root score
+BEST_POLL_NODES = 16
+
+
+class TranspositionTable:
+
+    # Fixed number of slots indexed by the position key. Each slot holds one
+    # entry (key, depth, score, flag, best move, generation). replace="always"
+    # lets a new position take over its slot; replace="depth" keeps an entry from
+    # the current search if it was searched deeper than the newcomer. Entries from
+    # earlier searches (older generations) are always replaceable.
+
+    def __init__(self, size=1 << 18, replace="depth"):
+        if replace not in ("always", "depth"):
+            raise ValueError(f"Unknown replacement policy: {replace}")
+        self.size = size
+        self.replace = replace
+        self.slots = {}
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+
+    # Start a new search: bump the generation and reset the hit counters
+    def new_search(self):
+        self.generation += 1
+        self.probes = 0
+        self.hits = 0
+
+    # Entry for key searched to exactly this depth, or None
+    def probe(self, key, depth):
+        self.probes += 1
+        entry = self.slots.get(key % self.size)
+        if entry is None or entry[0] != key or entry[1] != depth:
+            return None
+        self.hits += 1
+        return entry
+
+    def store(self, key, depth, score, flag, move):
+        slot = key % self.size
+        old = self.slots.get(slot)
+        if (old is not None and old[0] != key and self.replace == "depth"
+                and old[5] == self.generation and old[1] > depth):
+            return
+        self.slots[slot] = (key, depth, score, flag, move, self.generation)
+
+    # Best move stored for key at any depth (for move ordering), or None
+    def best_move(self, key):
+        entry = self.slots.get(key % self.size)
+        return entry[4] if entry is not None and entry[0] == key else None
+
+    def clear(self):
+        self.slots.clear()
+        self.new_search()
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+
 class Agent:
     
     # Intelligent agent for Hinger game using minimax or alpha-beta search.
     # Coordinates are zero-indexed: (row, col) with (0,0) at top-left.
     
     
-    def __init__(self, size, name="B9"):
-        """Initialize agent with board size and name."""
+    def __init__(self, size, name="B9", cache=True, tt_size=1 << 18, tt_replace="depth", ordering=True,
+                 processes=None):
+        """Initialize agent with board size and name.
+
+        cache controls memoisation of hinger queries: True uses the shared
+        region_cache, False disables it, or pass a RegionCache of your own.
+        tt_size is the number of transposition table slots (0 disables the
+        table) and tt_replace its replacement policy ("depth" or "always").
+        ordering enables hash-move, killer and history move ordering in
+        alpha-beta. processes is the pool size of the "parallel" mode (None
+        uses every core).
+        """
         self.size = size
         self.name = name
+        self.cache = cache
+        self.tt = TranspositionTable(tt_size, tt_replace) if tt_size else None
         self.nodes_searched = 0
+        self.ordering = ordering
+        self.killers = {}  # remaining depth -> up to two moves that caused a cutoff there
+        self.history = ({}, {})  # per side (minimizing, maximizing): (row, col) -> cutoff score
+        self.completed_depth = 0
+        self._deadline = None
+        self._root_depth = None
+        self._guess = None
+        self.processes = processes
+        self.worker_nodes = {}
+        self.eldest_nodes = 0
+        self._pool = None
+        self._pool_workers = 0
+        self._shared_best = None
+        self._next_root_move = None
+        self._parallel_searches = 0
+        self._window_stale = None
     
     def __str__(self):
         return f"Agent({self.name})"
     
-    def move(self, state, mode="alphabeta", depth=4):
+    def move(self, state, mode="alphabeta", depth=4, time_limit=None):
 
         """
         Select best move for current state.
         
         Args:
             state: current State object
-            mode: "minimax" or "alphabeta"
+            mode: "minimax", "alphabeta", "parallel" (alpha-beta with the
+                root moves split over a process pool) or "pvs" (negamax with
+                principal variation search inside an aspiration window; same
+                scores and moves as "alphabeta")
             depth: maximum search depth
+            time_limit: optional budget in seconds. The search then deepens
+                one ply at a time up to depth and returns the best move of the
+                deepest iteration that finished in time.
         
         Returns:
             (row, col) tuple or None if no legal moves
         """
 
         self.nodes_searched = 0
+        self.history = ({}, {})
+        self.worker_nodes = {}
+        if self.tt is not None:
+            self.tt.new_search()
         legal_moves = self._list_legal_moves(state)
         
         if not legal_moves:
@@ -55,32 +174,249 @@ class Agent:
                 return (r, c)
         
         # Search
-        if mode == "minimax":
-            score, best_move = self._minimax(state, depth, True)
-        elif mode == "alphabeta":
-            score, best_move = self._alphabeta(state, depth, float('-inf'), float('inf'), True)
-        else:
-            raise ValueError(f"Unknown mode: {mode}")
+        if time_limit is not None:
+            if mode == "parallel":
+                raise ValueError("time_limit is not supported in parallel mode")
+            return self._deepen(state, mode, depth, time_limit, legal_moves[0][:2])
+        score, best_move = self._search(state, mode, depth)
+        self.completed_depth = depth
         
         return best_move
+
+    def _search(self, state, mode, depth, first_move=None):
+        self._root_depth = depth
+        self.killers = {}
+        if mode == "minimax":
+            return self._minimax(state, depth, True, first_move)
+        if mode == "alphabeta":
+            return self._alphabeta(state, depth, float('-inf'), float('inf'), True, first_move)
+        if mode == "parallel":
+            return self._parallel_root(state, depth)
+        if mode == "pvs":
+            guess = self._guess if self._guess is not None else self._evaluate(state)
+            return self._aspiration(state, depth, guess, first_move)
+        raise ValueError(f"Unknown mode: {mode}")
+
+    # Root-parallel alpha-beta. The first root move is searched here with the
+    # full window to get a score (young brothers wait for the eldest), then this
+    # process and the pool's workers claim the other root moves in order from a
+    # shared counter. They share the best root score so far and the index of
+    # the first root move that reached it, so each root move is searched with
+    # nearly the window sequential alpha-beta would give it (see
+    # _search_root_moves). Moves that cannot win come back as bounds, and the
+    # move picked is the first root move with the highest score, exactly as in
+    # sequential alpha-beta at the same depth.
+    def _parallel_root(self, state, depth):
+        legal_moves = self._list_legal_moves(state)
+        self.nodes_searched += 1
+        self.worker_nodes = {}
+        if depth == 0 or len(legal_moves) < 2:
+            return self._alphabeta(state, depth, float('-inf'), float('inf'), True)
+
+        self._root_depth = depth
+        r, c, _ = legal_moves[0]
+        state.decrement(r, c)
+        best_score, _ = self._alphabeta(state, depth - 1, float('-inf'), float('inf'), False)
+        state.increment(r, c)
+        self.eldest_nodes = self.nodes_searched
+
+        pool = self._get_pool()
+        self._shared_best[:] = [best_score, 0]
+        self._next_root_move.value = 1
+        self._parallel_searches += 1
+        futures = [pool.submit(_worker_root_moves, state, legal_moves, depth, self._parallel_searches)
+                   for _ in range(self._pool_workers)]
+        results = [(0, best_score, True)]
+        results += self._search_root_moves(state, legal_moves, depth, self._shared_best, self._next_root_move)
+        self.worker_nodes["main"] = self.nodes_searched
+        for future in futures:
+            found, nodes, worker = future.result()
+            results += found
+            self.worker_nodes[worker] = self.worker_nodes.get(worker, 0) + nodes
+            self.nodes_searched += nodes
+
+        best = max(score for _, score, exact in results if exact)
+        k = min(k for k, score, exact in results if exact and score == best)
+        return (best, legal_moves[k][:2])
+
+    # Claim root moves from the shared counter and score them until none are
+    # left, returning [(index, score, exact)]. A score is exact if it beats the
+    # alpha of _root_child_alpha, otherwise an upper bound that cannot win. The
+    # search polls the shared best every BEST_POLL_NODES nodes and restarts with
+    # the higher alpha once another root move has raised it; the transposition
+    # table keeps what the abandoned pass already proved. Each pass runs on a
+    # clone, so an abandoned one cannot leave state half-changed.
+    def _search_root_moves(self, state, legal_moves, depth, shared_best, next_move):
+        results = []
+        while True:
+            with next_move.get_lock():
+                k = next_move.value
+                next_move.value += 1
+            if k >= len(legal_moves):
+                return results
+            try:
+                while True:
+                    alpha = _root_child_alpha(shared_best, k)
+                    self._window_stale = lambda: _root_child_alpha(shared_best, k) > alpha
+                    child = state.clone()
+                    child.decrement(*legal_moves[k][:2])
+                    try:
+                        score, _ = self._alphabeta(child, depth - 1, alpha, float('inf'), False)
+                        break
+                    except WindowRaised:
+                        pass
+            finally:
+                self._window_stale = None
+            if score > alpha:
+                with shared_best.get_lock():
+                    if score > shared_best[0] or (score == shared_best[0] and k < shared_best[1]):
+                        shared_best[:] = [score, k]
+            results.append((k, score, score > alpha))
+
+    # Process pool of the parallel mode, created on first use and kept until close()
+    def _get_pool(self):
+        if self._pool is None:
+            self._shared_best = multiprocessing.Array('d', [float('-inf'), 0])
+            self._next_root_move = multiprocessing.Value('i', 0)
+            self._pool_workers = self.processes or os.cpu_count() or 1
+            settings = {"size": self.size, "name": self.name, "cache": self.cache,
+                        "tt_size": self.tt.size if self.tt is not None else 0,
+                        "tt_replace": self.tt.replace if self.tt is not None else "depth",
+                        "ordering": self.ordering}
+            self._pool = ProcessPoolExecutor(max_workers=self._pool_workers, initializer=_init_search_worker,
+                                             initargs=(self._shared_best, self._next_root_move, settings))
+        return self._pool
+
+    # Shut down the parallel mode's process pool
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._shared_best = None
+            self._next_root_move = None
+
+    # Iterative deepening under a wall-clock budget: depth 1, 2, ... up to depth,
+    # each iteration trying the previous iteration's best move first at the root
+    # (positions it already scored at the same remaining depth come straight from
+    # the transposition table). A new iteration is not started when the last one
+    # took longer than the time left, as it would almost surely be cut off.
+    # The search runs on a clone, so a timeout cannot leave state half-changed.
+    # The "pvs" aspiration window is centred on the score from two iterations
+    # back: the evaluation swings with the side to move at the leaves, so the
+    # last iteration with the same leaf side is the better guess (the first two
+    # fall back to the root's static evaluation, as a fixed-depth search does).
+    def _deepen(self, state, mode, depth, time_limit, best_move):
+        root = state.clone()
+        self.completed_depth = 0
+        scores = {}
+        self._deadline = time.perf_counter() + time_limit
+        try:
+            for d in range(1, depth + 1):
+                started = time.perf_counter()
+                self._guess = scores.get(d - 2)
+                scores[d], best_move = self._search(root, mode, d, best_move)
+                self.completed_depth = d
+                now = time.perf_counter()
+                if now + (now - started) > self._deadline:
+                    break
+        except SearchTimeout:
+            pass
+        finally:
+            self._deadline = None
+            self._guess = None
+        return best_move
+
+    # Stop the current search once the deadline (if any) has passed, or, in a
+    # parallel worker, once a poll of the shared best root score finds the
+    # window stale
+    def _check_time(self):
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        if (self._window_stale is not None and self.nodes_searched % BEST_POLL_NODES == 0
+                and self._window_stale()):
+            raise WindowRaised()
+
+    # Move ordering below the root: hingers stay first (a hinger ends the search
+    # of the node), then the hash move from the transposition table, this ply's
+    # killer moves, and the rest by history score. Remaining depth identifies
+    # the ply, since every branch of one search starts from the same depth.
+    # The root keeps its order, so ties between root moves are still broken the
+    # same way and the chosen move does not depend on the ordering.
+    def _order_moves(self, legal_moves, depth, key, maximizing):
+        hash_move = self.tt.best_move(key) if self.tt is not None else None
+        killers = self.killers.get(depth, ())
+        history = self.history[maximizing]
+
+        def rank(move):
+            r, c, is_hinger = move
+            if is_hinger:
+                return (0, 0)
+            if (r, c) == hash_move:
+                return (1, 0)
+            if (r, c) in killers:
+                return (2, killers.index((r, c)))
+            return (3, -history.get((r, c), 0))
+
+        return sorted(legal_moves, key=rank)
+
+    # A quiet move caused a cutoff: make it a killer for this ply and raise its
+    # history score for the side that played it (deeper cutoffs count for more)
+    def _record_cutoff(self, move, depth, maximizing):
+        killers = self.killers.setdefault(depth, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        history = self.history[maximizing]
+        history[move] = history.get(move, 0) + depth * depth
+
+    # Legal moves with move (if given and present) taken out and put in front
+    def _move_first(self, legal_moves, move):
+        for k, (r, c, _) in enumerate(legal_moves):
+            if (r, c) == move:
+                return [legal_moves[k]] + legal_moves[:k] + legal_moves[k + 1:]
+        return legal_moves
+
+    # Counters of the last move() call
+    def search_stats(self):
+        stats = {"nodes_searched": self.nodes_searched, "completed_depth": self.completed_depth}
+        if self.tt is not None:
+            stats.update(tt_probes=self.tt.probes, tt_hits=self.tt.hits, tt_hit_rate=self.tt.hit_rate())
+        if self.worker_nodes:
+            stats["worker_nodes"] = dict(self.worker_nodes)
+            stats["eldest_nodes"] = self.eldest_nodes
+        return stats
+
+    # Transposition key: the board's Zobrist hash plus the side to move. Scores
+    # are only reused at exactly the depth they were searched to, so a table hit
+    # returns what the search itself would have returned.
+    def _tt_key(self, state, maximizing):
+        return (state.zobrist << 1) | maximizing
+
+    # Table entry for key at exactly this depth, or None. The root is never
+    # looked up: an entry stored where the moves were reordered (or under a
+    # narrowed window) could break root ties differently from a fresh search.
+    def _tt_probe(self, key, depth):
+        if self.tt is None or depth == self._root_depth:
+            return None
+        return self.tt.probe(key, depth)
+
+    # Store a (score, move) result in the table and pass it through
+    def _tt_store(self, key, depth, result, flag=EXACT):
+        if self.tt is not None:
+            self.tt.store(key, depth, result[0], flag, result[1])
+        return result
     
     def _list_legal_moves(self, state):
 
         # Generate legal moves as (row, col, is_hinger) tuples, hingers first.
 
         moves = []
-        current_regions = state.numRegions()
+        hingers = state.hingers(self.cache)
         
         for r in range(len(state.grid)):
             for c in range(len(state.grid[0])):
                 if state.grid[r][c] > 0:
-                    is_hinger = False
-                    if state.grid[r][c] == 1:
-                        test_state = state.clone()
-                        test_state.grid[r][c] = 0
-                        if test_state.numRegions() > current_regions:
-                            is_hinger = True
-                    moves.append((r, c, is_hinger))
+                    moves.append((r, c, (r, c) in hingers))
         
         moves.sort(key=lambda x: x[2], reverse=True)
         return moves
@@ -89,27 +425,37 @@ class Agent:
 
         # Heuristic: current hingers minus estimated opponent hingers.
 
-        current_hingers = state.numHingers()
+        current_hingers = state.numHingers(self.cache)
         
         legal_moves = self._list_legal_moves(state)
         max_opp_hingers = 0
         
         for r, c, _ in legal_moves[:3]:
             test_state = state.clone()
-            test_state.grid[r][c] -= 1
-            max_opp_hingers = max(max_opp_hingers, test_state.numHingers())
+            test_state.decrement(r, c)
+            max_opp_hingers = max(max_opp_hingers, test_state.numHingers(self.cache))
         
         return current_hingers - max_opp_hingers
     
-    def _minimax(self, state, depth, maximizing):
+    def _minimax(self, state, depth, maximizing, first_move=None):
 
         # Minimax search returning (score, move).
+        # first_move (root only) is searched before the other moves.
+        # Only exact table entries are reused: the table is shared with the
+        # alpha-beta modes, whose bounds are not minimax scores.
 
+        self._check_time()
         self.nodes_searched += 1
+        key = self._tt_key(state, maximizing)
+        entry = self._tt_probe(key, depth)
+        if entry is not None and entry[3] == EXACT:
+            return (entry[2], entry[4])
         legal_moves = self._list_legal_moves(state)
         
         if depth == 0 or not legal_moves:
-            return (self._evaluate(state) if legal_moves else 0, None)
+            return self._tt_store(key, depth, (self._evaluate(state) if legal_moves else 0, None))
+        if first_move is not None:
+            legal_moves = self._move_first(legal_moves, first_move)
         
         best_move = None
         
@@ -119,40 +465,60 @@ class Agent:
                 if is_hinger:
                     return (1, (r, c))
                 
-                original = state.grid[r][c]
-                state.grid[r][c] -= 1
+                state.decrement(r, c)
                 eval_score, _ = self._minimax(state, depth - 1, False)
-                state.grid[r][c] = original
+                state.increment(r, c)
                 
                 if eval_score > max_eval:
                     max_eval = eval_score
                     best_move = (r, c)
-            return (max_eval, best_move)
+            return self._tt_store(key, depth, (max_eval, best_move))
         else:
             min_eval = float('inf')
             for r, c, is_hinger in legal_moves:
                 if is_hinger:
                     return (-1, (r, c))
                 
-                original = state.grid[r][c]
-                state.grid[r][c] -= 1
+                state.decrement(r, c)
                 eval_score, _ = self._minimax(state, depth - 1, True)
-                state.grid[r][c] = original
+                state.increment(r, c)
                 
                 if eval_score < min_eval:
                     min_eval = eval_score
                     best_move = (r, c)
-            return (min_eval, best_move)
+            return self._tt_store(key, depth, (min_eval, best_move))
     
-    def _alphabeta(self, state, depth, alpha, beta, maximizing):
+    def _alphabeta(self, state, depth, alpha, beta, maximizing, first_move=None):
 
         # Alpha-beta pruning search returning (score, move).
+        # first_move (root only) is searched before the other moves.
+        # Stored scores keep their bound type: a result at or below alpha is an
+        # upper bound, one at or above beta a lower bound, anything between exact.
         
+        self._check_time()
         self.nodes_searched += 1
+        key = self._tt_key(state, maximizing)
+        entry = self._tt_probe(key, depth)
+        if entry is not None:
+            _, _, score, flag, move, _ = entry
+            if flag == EXACT:
+                return (score, move)
+            if flag == LOWER:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return (score, move)
         legal_moves = self._list_legal_moves(state)
         
         if depth == 0 or not legal_moves:
-            return (self._evaluate(state) if legal_moves else 0, None)
+            return self._tt_store(key, depth, (self._evaluate(state) if legal_moves else 0, None))
+        if first_move is not None:
+            legal_moves = self._move_first(legal_moves, first_move)
+        elif self.ordering and depth != self._root_depth:
+            legal_moves = self._order_moves(legal_moves, depth, key, maximizing)
+
+        alpha_orig, beta_orig = alpha, beta
         
         best_move = None
         
@@ -162,10 +528,9 @@ class Agent:
                 if is_hinger:
                     return (1, (r, c))
                 
-                original = state.grid[r][c]
-                state.grid[r][c] -= 1
+                state.decrement(r, c)
                 eval_score, _ = self._alphabeta(state, depth - 1, alpha, beta, False)
-                state.grid[r][c] = original
+                state.increment(r, c)
                 
                 if eval_score > max_eval:
                     max_eval = eval_score
@@ -173,18 +538,19 @@ class Agent:
                 
                 alpha = max(alpha, eval_score)
                 if beta <= alpha:
+                    if self.ordering:
+                        self._record_cutoff((r, c), depth, maximizing)
                     break
-            return (max_eval, best_move)
+            return self._tt_store(key, depth, (max_eval, best_move), self._bound(max_eval, alpha_orig, beta_orig))
         else:
             min_eval = float('inf')
             for r, c, is_hinger in legal_moves:
                 if is_hinger:
                     return (-1, (r, c))
                 
-                original = state.grid[r][c]
-                state.grid[r][c] -= 1
+                state.decrement(r, c)
                 eval_score, _ = self._alphabeta(state, depth - 1, alpha, beta, True)
-                state.grid[r][c] = original
+                state.increment(r, c)
                 
                 if eval_score < min_eval:
                     min_eval = eval_score
@@ -192,8 +558,148 @@ class Agent:
                 
                 beta = min(beta, eval_score)
                 if beta <= alpha:
+                    if self.ordering:
+                        self._record_cutoff((r, c), depth, maximizing)
                     break
-            return (min_eval, best_move)
+            return self._tt_store(key, depth, (min_eval, best_move), self._bound(min_eval, alpha_orig, beta_orig))
+
+    # Root search of the "pvs" mode. The window starts ASPIRATION_WINDOW either
+    # side of guess: the previous iteration's score when deepening, otherwise the
+    # root's static evaluation, which is the depth-0 score and in this game most
+    # often close to the searched one. A score on or outside an edge is only a
+    # bound, so that edge is opened and the depth searched again until the score
+    # lands inside.
+    def _aspiration(self, state, depth, guess, first_move=None):
+        alpha, beta = guess - ASPIRATION_WINDOW, guess + ASPIRATION_WINDOW
+        while True:
+            score, move = self._negamax(state, depth, alpha, beta, 1, first_move)
+            if score <= alpha:
+                alpha = float('-inf')
+            elif score >= beta:
+                beta = float('inf')
+            else:
+                return (score, move)
+
+    def _negamax(self, state, depth, alpha, beta, color, first_move=None):
+
+        # Negamax with principal variation search, returning (score, move).
+        # color is 1 when the maximizing player is to move and -1 otherwise;
+        # scores are from the side to move's view, so a node's score is color
+        # times its alpha-beta score and a hinger is always worth 1.
+        # first_move (root only) is searched before the other moves.
+        # The first move is searched with the full window, the rest with a null
+        # window (alpha, alpha + 1) that only proves them no better; a move that
+        # beats alpha is searched again with (score, beta) for its exact score.
+        # Only a strictly better score replaces the best move, so ties go to the
+        # earlier root move as in alpha-beta. The root keeps its order and skips
+        # the table, so a bound left by an aspiration re-search cannot cut it.
+        # Table entries are stored from the maximizing player's view and shared
+        # with the other modes.
+
+        self._check_time()
+        self.nodes_searched += 1
+        maximizing = color > 0
+        key = self._tt_key(state, maximizing)
+        root = depth == self._root_depth
+        entry = self._tt_probe(key, depth)
+        if entry is not None:
+            _, _, score, flag, move, _ = entry
+            score *= color
+            if flag == EXACT:
+                return (score, move)
+            if (flag == LOWER) == maximizing:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return (score, move)
+        legal_moves = self._list_legal_moves(state)
+
+        if depth == 0 or not legal_moves:
+            score = self._evaluate(state) if legal_moves else 0
+            self._tt_store(key, depth, (score, None))
+            return (color * score, None)
+        if first_move is not None:
+            legal_moves = self._move_first(legal_moves, first_move)
+        elif self.ordering and not root:
+            legal_moves = self._order_moves(legal_moves, depth, key, maximizing)
+
+        alpha_orig, beta_orig = alpha, beta
+        best_score, best_move = float('-inf'), None
+        for k, (r, c, is_hinger) in enumerate(legal_moves):
+            if is_hinger:
+                return (1, (r, c))
+
+            state.decrement(r, c)
+            if k == 0:
+                score = -self._negamax(state, depth - 1, -beta, -alpha, -color)[0]
+            else:
+                score = -self._negamax(state, depth - 1, -alpha - 1, -alpha, -color)[0]
+                if alpha < score < beta:
+                    score = -self._negamax(state, depth - 1, -beta, -score, -color)[0]
+            state.increment(r, c)
+
+            if score > best_score:
+                best_score, best_move = score, (r, c)
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                if self.ordering:
+                    self._record_cutoff((r, c), depth, maximizing)
+                break
+
+        flag = self._bound(best_score, alpha_orig, beta_orig)
+        if not maximizing and flag != EXACT:
+            flag = LOWER if flag == UPPER else UPPER
+        self._tt_store(key, depth, (color * best_score, best_move), flag)
+        return (best_score, best_move)
+
+    # Bound type of a score searched with the window (alpha, beta)
+    def _bound(self, score, alpha, beta):
+        if score <= alpha:
+            return UPPER
+        if score >= beta:
+            return LOWER
+        return EXACT
+
+
+# --- Parallel search workers ---
+# Each pool process keeps one Agent (and so its transposition table) for its
+# whole life, plus the shared (best root score, index of the first root move
+# with it) and next unclaimed root move of the current search.
+_worker = {}
+
+
+def _init_search_worker(shared_best, next_move, settings):
+    _worker["best"] = shared_best
+    _worker["next"] = next_move
+    _worker["agent"] = Agent(**settings)
+
+
+# Alpha for root move k: root move k only wins with a score above the shared
+# best if an earlier move holds it, or tying it if a later one does (scores are
+# integers, so alpha one below the best still scores a tie exactly)
+def _root_child_alpha(shared_best, k):
+    with shared_best.get_lock():
+        best, holder = shared_best[0], shared_best[1]
+    return best if holder < k else best - 1
+
+
+# Pool task: score root moves as Agent._search_root_moves does, returning
+# (results, nodes searched, worker pid). Killers, history and the table's
+# generation carry over between the root moves of one search, as they do in
+# sequential alpha-beta, and are reset when a new search starts.
+def _worker_root_moves(state, legal_moves, depth, search_id):
+    agent = _worker["agent"]
+    if _worker.get("search") != search_id:
+        _worker["search"] = search_id
+        agent.killers = {}
+        agent.history = ({}, {})
+        if agent.tt is not None:
+            agent.tt.new_search()
+    agent.nodes_searched = 0
+    agent._root_depth = depth
+    results = agent._search_root_moves(state, legal_moves, depth, _worker["best"], _worker["next"])
+    return results, agent.nodes_searched, os.getpid()
 
 
 def tester():
@@ -216,12 +722,12 @@ def tester():
     
     # Test minimax at depth 4
     move_mm = agent.move(state, mode="minimax", depth=4)
-    print(f"Minimax (depth=4): {move_mm}, nodes: {agent.nodes_searched}")
+    print(f"Minimax (depth=4): {move_mm}, nodes: {agent.nodes_searched}, TT hit rate: {agent.tt.hit_rate():.0%}")
     assert move_mm is not None, "Should find a move"
     
     # Test alphabeta at depth 4 (should be faster due to pruning)
     move_ab = agent.move(state, mode="alphabeta", depth=4)
-    print(f"Alpha-beta (depth=4): {move_ab}, nodes: {agent.nodes_searched}")
+    print(f"Alpha-beta (depth=4): {move_ab}, nodes: {agent.nodes_searched}, TT hit rate: {agent.tt.hit_rate():.0%}")
     assert move_ab is not None, "Should find a move"
     print("[OK] Agent finds moves in neutral position")
     
@@ -241,7 +747,7 @@ def tester():
     r, c = move_mm
     # Verify it's actually a hinger (value=1 and increases regions)
     test_state = state.clone()
-    test_state.grid[r][c] = 0
+    test_state.apply((r, c))
     is_hinger = state.grid[r][c] == 1 and test_state.numRegions() > state.numRegions()
     assert is_hinger, f"Move {move_mm} should be a hinger"
     print(f"Minimax picked hinger at {move_mm} [OK]")
@@ -251,7 +757,7 @@ def tester():
     assert move_ab is not None, "Should find a hinger move"
     r, c = move_ab
     test_state = state.clone()
-    test_state.grid[r][c] = 0
+    test_state.apply((r, c))
     is_hinger = state.grid[r][c] == 1 and test_state.numRegions() > state.numRegions()
     assert is_hinger, f"Move {move_ab} should be a hinger"
     print(f"Alpha-beta picked hinger at {move_ab} [OK]")
@@ -268,13 +774,129 @@ def tester():
     
     # Test with lower depth (3) for reasonable performance
     move_mm = agent.move(state, mode="minimax", depth=3)
-    print(f"Minimax (depth=3): {move_mm}, nodes: {agent.nodes_searched}")
+    print(f"Minimax (depth=3): {move_mm}, nodes: {agent.nodes_searched}, TT hit rate: {agent.tt.hit_rate():.0%}")
     assert move_mm is not None, "Should find a move"
     
     move_ab = agent.move(state, mode="alphabeta", depth=3)
-    print(f"Alpha-beta (depth=3): {move_ab}, nodes: {agent.nodes_searched}")
+    print(f"Alpha-beta (depth=3): {move_ab}, nodes: {agent.nodes_searched}, TT hit rate: {agent.tt.hit_rate():.0%}")
     assert move_ab is not None, "Should find a move"
     print("[OK] Agent handles neutral midgame")
+
+    # Test D: Transposition table - same moves, fewer nodes
+    print("\n--- Test D: Transposition Table ---")
+    grid = [[2, 1, 2, 1], [1, 2, 1, 2], [2, 1, 2, 1], [1, 2, 1, 2]]
+    state = State(grid, size=4)
+    for mode in ("minimax", "alphabeta"):
+        plain = Agent(size=(4, 4), name="NoTable", tt_size=0)
+        agent = Agent(size=(4, 4), name="Table")
+        move_plain = plain.move(state, mode=mode, depth=4)
+        move_tt = agent.move(state, mode=mode, depth=4)
+        assert move_plain == move_tt, f"{mode}: {move_plain} != {move_tt}"
+        stats = agent.search_stats()
+        print(f"{mode:9} (depth=4): {move_tt}, nodes: {plain.nodes_searched} -> {stats['nodes_searched']},"
+              f" TT hits: {stats['tt_hits']}/{stats['tt_probes']} ({stats['tt_hit_rate']:.0%})")
+    print("[OK] Transposition table keeps the moves and saves nodes")
+
+    # Test E: Time budget - iterative deepening returns within the budget
+    print("\n--- Test E: Time Budget ---")
+    grid = [[2, 1, 2, 1, 2], [1, 2, 1, 2, 1], [2, 1, 2, 1, 2], [1, 2, 1, 2, 1], [2, 1, 2, 1, 2]]
+    state = State(grid, size=5)
+    agent = Agent(size=(5, 5), name="Timed")
+    start_time = time.perf_counter()
+    move_id = agent.move(state, mode="alphabeta", depth=6, time_limit=0.5)
+    duration = time.perf_counter() - start_time
+    assert move_id is not None and state == State(grid), "Should return a move and leave the state alone"
+    assert duration < 0.5 + 0.2, f"Took {duration:.2f}s for a 0.5s budget"
+    print(f"Alpha-beta (depth<=6, 0.5s): {move_id}, completed depth: {agent.completed_depth},"
+          f" nodes: {agent.nodes_searched}, time: {duration:.2f}s")
+    print("[OK] Agent respects the time budget")
+
+    # Test F: Move ordering - same moves, fewer nodes at depth 4-6
+    print("\n--- Test F: Move Ordering ---")
+    boards = [
+        [[1, 2, 0, 1, 1], [2, 0, 1, 2, 0], [0, 1, 2, 0, 1], [1, 2, 0, 1, 2], [1, 0, 1, 2, 1]],
+        [[2, 1, 0, 1, 2], [1, 1, 2, 0, 1], [0, 2, 1, 1, 0], [1, 0, 2, 1, 1], [2, 1, 0, 1, 2]],
+    ]
+    for depth in (4, 5, 6):
+        nodes = {False: 0, True: 0}
+        for grid in boards:
+            state = State(grid, size=5)
+            moves = set()
+            for ordering in (False, True):
+                agent = Agent(size=(5, 5), name="Ordered", ordering=ordering)
+                moves.add(agent.move(state, mode="alphabeta", depth=depth))
+                nodes[ordering] += agent.nodes_searched
+            assert len(moves) == 1, f"Ordering changed the move at depth {depth}: {moves}"
+        assert nodes[True] < nodes[False], f"Ordering saved no nodes at depth {depth}: {nodes}"
+        print(f"Alpha-beta (depth={depth}): nodes without ordering: {nodes[False]}, with: {nodes[True]}"
+              f" ({1 - nodes[True] / nodes[False]:.0%} fewer)")
+    print("[OK] Move ordering keeps the moves and searches fewer nodes")
+
+    # Test G: Root-parallel search returns the sequential alpha-beta move
+    print("\n" + "-" * 60)
+    print("Test G: Parallel root search (main process + 2 workers)")
+    print("-" * 60)
+    parallel_agent = Agent(size=(5, 5), name="Parallel", processes=2)
+    nodes = {"alphabeta": 0, "parallel": 0}
+    try:
+        for grid in boards:
+            state = State(grid, size=5)
+            for depth in (4, 5):
+                sequential_agent = Agent(size=(5, 5), name="Sequential")
+                start_time = time.perf_counter()
+                expected = sequential_agent.move(state, mode="alphabeta", depth=depth)
+                sequential_time = time.perf_counter() - start_time
+                start_time = time.perf_counter()
+                found = parallel_agent.move(state, mode="parallel", depth=depth)
+                parallel_time = time.perf_counter() - start_time
+                assert found == expected, f"Parallel move {found} != sequential move {expected}"
+                nodes["alphabeta"] += sequential_agent.nodes_searched
+                nodes["parallel"] += parallel_agent.nodes_searched
+                stats = parallel_agent.search_stats()
+                worker_nodes = stats["worker_nodes"]
+                print(f"Depth {depth}: move {found} | Sequential: {sequential_time:.3f}s "
+                      f"({sequential_agent.nodes_searched} nodes) | Parallel: {parallel_time:.3f}s "
+                      f"({parallel_agent.nodes_searched} nodes) | Speedup: {sequential_time / parallel_time:.2f}x")
+                # The main process searches the eldest move alone, then claims
+                # root moves side by side with the workers
+                critical_path = max(worker_nodes["main"], stats["eldest_nodes"]
+                                    + max(n for w, n in worker_nodes.items() if w != "main"))
+                print(f"  Nodes per worker: {worker_nodes} | Speedup bound from nodes: "
+                      f"{sequential_agent.nodes_searched / critical_path:.2f}x on {os.cpu_count()} CPU(s)")
+    finally:
+        parallel_agent.close()
+    # The shared best score keeps the workers' windows close to sequential ones
+    assert nodes["parallel"] < 2 * nodes["alphabeta"], f"Parallel search did too much work: {nodes}"
+    print("[OK] Parallel search returns the sequential moves")
+
+    # Test H: Negamax with PVS matches alpha-beta in fewer nodes
+    print("\n--- Test H: Negamax with PVS ---")
+    for depth in (4, 5, 6):
+        nodes = {"alphabeta": 0, "pvs": 0}
+        for grid in boards:
+            state = State(grid, size=5)
+            results = set()
+            for mode in nodes:
+                agent = Agent(size=(5, 5), name=mode)
+                score, _ = agent._search(state, mode, depth)
+                agent = Agent(size=(5, 5), name=mode)
+                results.add((score, agent.move(state, mode=mode, depth=depth)))
+                nodes[mode] += agent.nodes_searched
+            assert len(results) == 1, f"PVS differs from alpha-beta at depth {depth}: {results}"
+        print(f"Depth {depth}: alpha-beta nodes: {nodes['alphabeta']}, pvs: {nodes['pvs']}")
+        assert nodes["pvs"] < nodes["alphabeta"], f"PVS searched more nodes at depth {depth}: {nodes}"
+    nodes = {"alphabeta": 0, "pvs": 0}
+    for grid in boards:
+        state = State(grid, size=5)
+        moves = set()
+        for mode in nodes:
+            agent = Agent(size=(5, 5), name=mode)
+            moves.add(agent.move(state, mode=mode, depth=6, time_limit=60))
+            nodes[mode] += agent.nodes_searched
+        assert len(moves) == 1, f"PVS with aspiration windows changed the move: {moves}"
+    print(f"Deepening to 6 with aspiration windows: alpha-beta nodes: {nodes['alphabeta']}, pvs: {nodes['pvs']}")
+    assert nodes["pvs"] < nodes["alphabeta"], f"PVS searched more nodes when deepening: {nodes}"
+    print("[OK] PVS returns the alpha-beta scores and moves in fewer nodes")
     
     print("\n" + "=" * 60)
     print("All tests passed!")
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Hinger Project
+Coursework 001 for: CMP-6058A Artificial Intelligence
+
+Batch Evaluation
+Scores whole stacks of boards at once with NumPy: region counts, hinger counts
+and hinger masks for an (N, rows, cols) array, matching the State methods.
+
+@author: B9 (1004411839, 100434969, and 100440712)
+@date: 17/10/2026
+"""
+
+import random
+
+import numpy as np
+
+from a1_state import State
+
+
+# Stack a list of equally sized States into an (N, rows, cols) array
+def stack_states(states):
+    return np.array([[list(row) for row in state.grid] for state in states], dtype=np.int64)
+
+
+# Connected-component labelling of a boolean (N, rows, cols) occupancy stack.
+# Every occupied cell starts with its own id; each pass takes the max id over the
+# 3x3 neighbourhood (as a row max then a column max), so a region ends up tagged
+# with the largest id it contains. Boards drop out of the loop once they settle.
+# Returns (labels, ids) where ids holds each cell's starting id.
+def label_batch(occupied):
+    n, rows, cols = occupied.shape
+    ids = np.arange(1, rows * cols + 1, dtype=np.int32).reshape(1, rows, cols)
+    labels = np.where(occupied, ids, 0).astype(np.int32)
+    active = np.arange(n)
+    while active.size:
+        current = labels[active]
+        spread = current.copy()
+        np.maximum(spread[:, :, 1:], current[:, :, :-1], out=spread[:, :, 1:])
+        np.maximum(spread[:, :, :-1], current[:, :, 1:], out=spread[:, :, :-1])
+        rows_max = spread.copy()
+        np.maximum(spread[:, 1:, :], rows_max[:, :-1, :], out=spread[:, 1:, :])
+        np.maximum(spread[:, :-1, :], rows_max[:, 1:, :], out=spread[:, :-1, :])
+        spread *= occupied[active]
+        changed = (spread != current).any(axis=(1, 2))
+        labels[active] = spread
+        active = active[changed]
+    return labels, ids
+
+
+# Number of regions per board: one per cell that kept its own id
+def count_regions_batch(occupied):
+    labels, ids = label_batch(occupied)
+    return (occupied & (labels == ids)).sum(axis=(1, 2))
+
+
+# Evaluate a stack of boards. Returns (regions, hinger_counts, hinger_masks) with
+# shapes (N,), (N,) and (N, rows, cols). Each removal test runs once per cell
+# position, vectorised over the boards that hold a single counter there.
+def evaluate_batch(boards):
+    boards = np.asarray(boards)
+    if boards.ndim != 3:
+        raise ValueError(f"Expected an (N, rows, cols) array, got shape {boards.shape}")
+    occupied = boards > 0
+    regions = count_regions_batch(occupied)
+    hinger_masks = np.zeros(boards.shape, dtype=bool)
+    _, rows, cols = boards.shape
+    for i in range(rows):
+        for j in range(cols):
+            candidates = np.flatnonzero(boards[:, i, j] == 1)
+            if candidates.size == 0:
+                continue
+            removed = occupied[candidates]
+            removed[:, i, j] = False
+            hinger_masks[candidates, i, j] = count_regions_batch(removed) > regions[candidates]
+    return regions, hinger_masks.sum(axis=(1, 2)), hinger_masks
+
+
+# Function to check the batch results against the scalar State methods
+def tester():
+    rng = random.Random(6058)
+    states = [State([[rng.choice([0, 0, 1, 1, 2]) for _ in range(5)] for _ in range(5)])
+              for _ in range(500)]
+    regions, hinger_counts, hinger_masks = evaluate_batch(stack_states(states))
+    for k, state in enumerate(states):
+        assert regions[k] == state.numRegions()
+        assert hinger_counts[k] == state.numHingers()
+        assert set(zip(*np.nonzero(hinger_masks[k]))) == state.hingers()
+    print(states[0])
+    print("Regions:", regions[0], "| Hingers:", hinger_counts[0])
+    print("[OK] Batch results match State on", len(states), "boards")
+
+
+# Call a tester function only when this file is executed
+if __name__ == "__main__":
+    tester()
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Hinger Project
+Coursework 001 for: CMP-6058A Artificial Intelligence
+
+Bitboard State
+Compact State variant: counters live in a flat array and occupancy is kept as
+a Python int bitmask, so region counting runs as shift-and-mask flood fills.
+
+@author: B9 (1004411839, 100434969, and 100440712)
+@date: 17/10/2026
+"""
+
+from array import array
+import pickle
+import random
+
+from a1_state import State, GridView, decode_cells, encode_cells, find_hingers, zobrist_key
+
+
+class BitState(State):
+
+    # Drop-in replacement for State backed by an array('H') of counters and two
+    # bitmasks: "occ" (cell > 0) and "ones" (cell == 1).
+    # Bit index of cell (i, j) is i * stride + j with stride = cols + 1. The spare
+    # column is never set, so shifting a row sideways cannot wrap into the next row.
+
+    def __init__(self, grid=None, size=5):
+        if grid is None:
+            grid = [[0 for _ in range(size)] for _ in range(size)]
+        self._load(grid)
+
+    # (Re)build the buffers from any nested grid (list of lists or GridView)
+    def _load(self, grid):
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if self.rows else 0
+        self.stride = self.cols + 1
+        self.counts = array('H', [cell for row in grid for cell in row])
+        self.occ = 0
+        self.ones = 0
+        self.zobrist = 0
+        self.total = sum(self.counts)
+        for k, value in enumerate(self.counts):
+            if value:
+                i, j = divmod(k, self.cols)
+                bit = 1 << (i * self.stride + j)
+                self.occ |= bit
+                if value == 1:
+                    self.ones |= bit
+                self.zobrist ^= zobrist_key(i, j, value)
+
+    # Expose the board through the usual .grid interface
+    @property
+    def grid(self):
+        return GridView(self)
+
+    @grid.setter
+    def grid(self, value):
+        self._load(value)
+
+    def _get_cell(self, i, j):
+        return self.counts[i * self.cols + j]
+
+    # Every write (including through .grid) keeps the masks, hash and total in sync
+    def _set_cell(self, i, j, value):
+        k = i * self.cols + j
+        self.zobrist ^= zobrist_key(i, j, self.counts[k]) ^ zobrist_key(i, j, value)
+        self.total += value - self.counts[k]
+        self.counts[k] = value
+        bit = 1 << (i * self.stride + j)
+        self.occ = self.occ | bit if value > 0 else self.occ & ~bit
+        self.ones = self.ones | bit if value == 1 else self.ones & ~bit
+
+    # Yield (i, j) for every set bit of mask, in row-major order
+    def _cells(self, mask):
+        while mask:
+            low = mask & -mask
+            yield divmod(low.bit_length() - 1, self.stride)
+            mask ^= low
+
+    # Grow seed through the 8-neighbourhood inside mask until it stops changing
+    def _flood(self, seed, mask):
+        stride = self.stride
+        region = seed
+        while True:
+            spread = region | (region << 1) | (region >> 1)
+            spread |= (spread << stride) | (spread >> stride)
+            spread &= mask
+            if spread == region:
+                return region
+            region = spread
+
+    def _count_mask_regions(self, mask):
+        regions = 0
+        while mask:
+            region = self._flood(mask & -mask, mask)
+            mask &= ~region
+            regions += 1
+        return regions
+
+    def clone(self):
+        new_state = BitState.__new__(BitState)
+        new_state.rows, new_state.cols, new_state.stride = self.rows, self.cols, self.stride
+        new_state.counts = array('H', self.counts)
+        new_state.occ = self.occ
+        new_state.ones = self.ones
+        new_state.zobrist = self.zobrist
+        new_state.total = self.total
+        return new_state
+
+    # Same move order as State.moves (row-major over non-zero cells)
+    def moves(self):
+        for i, j in self._cells(self.occ):
+            new_state = self.clone()
+            new_state.decrement(i, j)
+            yield new_state
+
+    def _count_regions(self):
+        return self._count_mask_regions(self.occ)
+
+    def decrement(self, i, j):
+        self._set_cell(i, j, self.counts[i * self.cols + j] - 1)
+
+    def increment(self, i, j):
+        self._set_cell(i, j, self.counts[i * self.cols + j] + 1)
+
+    def rehash(self):
+        self._load(self.grid.tolist())
+        return self.zobrist
+
+    def _find_hingers(self):
+        return find_hingers({(i, j): self.counts[i * self.cols + j] for i, j in self._cells(self.occ)})
+
+    def get_active_cells(self):
+        return list(self._cells(self.occ))
+
+    def is_empty(self):
+        return self.occ == 0
+
+    # Plain list-of-lists State with the same contents
+    def to_state(self):
+        return State(self.grid)
+
+    # Same bytes as State.to_bytes, straight from the counter array
+    def to_bytes(self):
+        return encode_cells(self.rows, self.cols, self.counts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        rows, cols, flat = decode_cells(data)
+        return cls([flat[i * cols:(i + 1) * cols] for i in range(rows)])
+
+
+# Function to check BitState against State on the sample board and random boards
+def tester():
+    grid = [
+        [1, 1, 0, 0, 2],
+        [0, 1, 0, 1, 0],
+        [1, 0, 0, 0, 0],
+        [0, 2, 1, 1, 1],
+    ]
+    bits = BitState(grid)
+    print(bits)
+    print("Number of regions:", bits.numRegions())
+    print("Number of hingers:", bits.numHingers())
+    print("Active cells:", bits.get_active_cells())
+    print("Is empty?:", bits.is_empty())
+
+    rng = random.Random(6058)
+    for _ in range(200):
+        rows, cols = rng.randint(1, 7), rng.randint(1, 7)
+        g = [[rng.choice([0, 0, 1, 1, 2, 3]) for _ in range(cols)] for _ in range(rows)]
+        dense, bits = State(g), BitState(g)
+        assert bits.numRegions() == dense.numRegions()
+        assert bits.numHingers() == dense.numHingers()
+        assert bits.hingers() == dense.hingers()
+        assert bits.get_active_cells() == dense.get_active_cells()
+        assert bits.is_empty() == dense.is_empty()
+        assert [m.grid for m in bits.moves()] == [m.grid for m in dense.moves()]
+        assert str(bits.grid) == str(dense.grid) and str(bits) == str(dense)
+        assert bits == dense and hash(bits) == hash(dense)
+        assert [m.zobrist for m in bits.moves()] == [m.rehash() for m in dense.moves()]
+        assert bits.to_bytes() == dense.to_bytes() and pickle.loads(pickle.dumps(bits)) == bits
+
+    # .grid writes must keep the bitmasks in sync
+    bits = BitState([[1, 1, 1]])
+    bits.grid[0][1] -= 1
+    assert bits.grid == [[1, 0, 1]] and bits.numRegions() == 2
+    print("[OK] BitState matches State on 200 random boards")
+
+
+# Call a tester function only when this file is executed
+if __name__ == "__main__":
+    tester()
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+Hinger Project
+Coursework 001 for: CMP-6058A Artificial Intelligence
+
+External-Memory BFS
+Breadth-first path search that keeps each layer as a sorted file of encoded
+boards on disk instead of a deque and visited set in RAM, so the state space
+can be far larger than memory.
+
+@author: B9 (1004411839, 100434969, and 100440712)
+@date: 17/10/2026
+"""
+
+from array import array
+import heapq
+import os
+import random
+import shutil
+import tempfile
+
+from a1_state import State, cell_typecode
+from a2_path import SafetyFacts, _predecessors, can_reach, counters, path_BFS, random_pair
+
+
+class LayerFile:
+
+    # One BFS layer on disk: fixed-size records (the cells row-major, each as
+    # wide as the start board needs) in strictly increasing byte order. Sorting the raw boards makes duplicate
+    # removal a merge and membership a binary search over the file.
+
+    def __init__(self, filename, record_size):
+        self.filename = filename
+        self.record_size = record_size
+        self.count = os.path.getsize(filename) // record_size
+
+    def __len__(self):
+        return self.count
+
+    # Stream the records back in order, reading 4096 records at a time
+    def __iter__(self):
+        size = self.record_size
+        with open(self.filename, "rb") as f:
+            while True:
+                block = f.read(size * 4096)
+                if not block:
+                    return
+                for k in range(0, len(block), size):
+                    yield block[k:k + size]
+
+    # Binary search for one record without loading the file
+    def __contains__(self, record):
+        size = self.record_size
+        with open(self.filename, "rb") as f:
+            lo, hi = 0, self.count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                f.seek(mid * size)
+                found = f.read(size)
+                if found == record:
+                    return True
+                if found < record:
+                    lo = mid + 1
+                else:
+                    hi = mid
+        return False
+
+
+# Write records (any order, duplicates allowed) as one sorted, duplicate-free run
+def _write_run(filename, records):
+    with open(filename, "wb") as f:
+        f.write(b"".join(sorted(records)))
+
+
+# Most runs opened at once by one merge pass, well under the usual file limit
+MERGE_FAN_IN = 64
+
+
+# Merge sorted runs into one sorted file, dropping records seen in more than one run
+def _merge_files(filename, runs, record_size):
+    previous = None
+    with open(filename, "wb") as f:
+        for record in heapq.merge(*(LayerFile(run, record_size) for run in runs)):
+            if record != previous:
+                f.write(record)
+                previous = record
+    for run in runs:
+        os.remove(run)
+
+
+# Merge sorted runs into one sorted layer, fan_in runs at a time: while there
+# are more, groups of fan_in are merged into intermediate runs first
+def _merge_runs(filename, runs, record_size, fan_in=MERGE_FAN_IN):
+    passes = 0
+    while len(runs) > fan_in:
+        passes += 1
+        merged = []
+        for k in range(0, len(runs), fan_in):
+            merged.append(f"{filename}.pass{passes}.{len(merged)}")
+            _merge_files(merged[-1], runs[k:k + fan_in], record_size)
+        runs = merged
+    _merge_files(filename, runs, record_size)
+    return LayerFile(filename, record_size)
+
+
+# --- External-memory BFS ---
+# Every move removes exactly one counter, so layer d holds exactly the states with
+# counters(start) - d counters and no state can appear in two layers: duplicates
+# only ever occur inside the layer being generated. Successors are collected in a
+# set of at most buffer_size boards, spilled as sorted runs and merged into the
+# next layer file. The safety memo is capped at buffer_size entries too and
+# started afresh when it fills, so RAM does not grow with the layer size. The
+# goal can only sit in layer counters(start) - counters(end),
+# so the search stops there; the path is then rebuilt backwards by looking each
+# state's safe predecessors up in the previous layer file.
+# Layer files go to folder (a temporary directory by default) and are removed on
+# return unless keep_files is set.
+def path_BFS_external(start, end, folder=None, buffer_size=1000000, stats=None, keep_files=False):
+    rows, cols = len(start.grid), len(start.grid[0])
+    # Counters only go down from start, so start's largest counter sets the width
+    code = cell_typecode(max((cell for row in start.grid for cell in row), default=0))
+    record_size = rows * cols * array(code).itemsize
+    factory = type(start)
+
+    def encode(state):
+        return array(code, [cell for row in state.grid for cell in row]).tobytes()
+
+    def decode(record):
+        flat = array(code, record)
+        return factory([flat[i * cols:(i + 1) * cols].tolist() for i in range(rows)])
+
+    workdir = tempfile.mkdtemp(prefix="hinger_bfs_", dir=folder)
+    layers = []
+    expanded = edges = evals = spilled = 0
+    peak = peak_memo = 0
+
+    try:
+        goal_depth = counters(start) - counters(end)
+        if goal_depth < 0 or not can_reach(start, end):
+            return None
+        first = os.path.join(workdir, "layer_0.bin")
+        _write_run(first, [encode(start)])
+        layers.append(LayerFile(first, record_size))
+
+        for depth in range(goal_depth):
+            # Facts are only shared between a layer and its successors, so each
+            # layer starts a fresh memo instead of growing one for the whole search
+            facts = SafetyFacts()
+            buffer, runs = set(), []
+            for record in layers[-1]:
+                memo = len(facts.hinger_counts) + len(facts.region_counts)
+                peak_memo = max(peak_memo, memo)
+                if memo >= buffer_size:
+                    expanded += facts.expanded
+                    edges += facts.edges
+                    evals += memo
+                    facts = SafetyFacts()
+                state = decode(record)
+                if facts.blocked(state):
+                    continue
+                facts.expanded += 1
+                before = facts.regions(state)
+                for move in state.legal_moves():
+                    state.apply(move)
+                    if can_reach(state, end) and facts.safe_applied(state, before):
+                        buffer.add(encode(state))
+                        if len(buffer) >= buffer_size:
+                            runs.append(os.path.join(workdir, f"layer_{depth + 1}.run{len(runs)}"))
+                            _write_run(runs[-1], buffer)
+                            spilled += 1
+                            peak = buffer_size
+                            buffer = set()
+                    state.undo(move)
+            peak = max(peak, len(buffer))
+            if buffer or not runs:
+                runs.append(os.path.join(workdir, f"layer_{depth + 1}.run{len(runs)}"))
+                _write_run(runs[-1], buffer)
+            expanded += facts.expanded
+            edges += facts.edges
+            evals += len(facts.hinger_counts) + len(facts.region_counts)
+            layers.append(_merge_runs(os.path.join(workdir, f"layer_{depth + 1}.bin"), runs, record_size))
+            if len(layers[-1]) == 0:
+                return None
+
+        if encode(end) not in layers[-1]:
+            return None
+        # Walk back one layer at a time: any predecessor present in the previous
+        # layer file was reached by the forward search
+        facts = SafetyFacts()
+        path = [end]
+        for layer in reversed(layers[:-1]):
+            for prev in _predecessors(path[-1], start, facts):
+                if encode(prev) in layer:
+                    path.append(prev)
+                    break
+        path.reverse()
+        return path
+    finally:
+        if stats is not None:
+            stats["expanded"] = expanded
+            stats["edges"] = edges
+            stats["safety_evals"] = evals
+            stats["layers"] = len(layers)
+            stats["largest_layer"] = max((len(layer) for layer in layers), default=0)
+            stats["spilled_runs"] = spilled
+            stats["peak_buffer"] = peak
+            stats["peak_memo"] = peak_memo
+            stats["disk_bytes"] = sum(len(layer) * record_size for layer in layers)
+        if not keep_files:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+# Function to check the external search against path_BFS with a tiny spill buffer
+def tester():
+    start = State([[2, 1, 2], [1, 2, 1], [2, 1, 2]])
+    end = State([[1, 1, 1], [1, 1, 1], [1, 1, 1]])
+    stats = {}
+    path = path_BFS_external(start, end, buffer_size=4, stats=stats)
+    print("Path found with", len(path) - 1, "moves")
+    print(f"Layers: {stats['layers']} | Largest layer: {stats['largest_layer']} | "
+          f"Spilled runs: {stats['spilled_runs']} | Disk: {stats['disk_bytes']} bytes")
+
+    # Memo and merge stay bounded when layers are far larger than the buffer
+    start, end = State([[2] * 4 for _ in range(3)]), State([[1] * 4 for _ in range(3)])
+    stats = {}
+    path = path_BFS_external(start, end, buffer_size=10, stats=stats)
+    # one expansion adds the state's two facts and at most two per successor
+    assert len(path) == 13 and stats["peak_memo"] < 10 + 2 + 2 * 12
+    assert stats["spilled_runs"] > MERGE_FAN_IN
+    print(f"Buffer 10 | Largest layer: {stats['largest_layer']} | Peak memo: {stats['peak_memo']} | "
+          f"Spilled runs: {stats['spilled_runs']}")
+
+    rng = random.Random(6058)
+    for k in range(30):
+        rows, cols = rng.choice([(2, 3), (3, 3), (3, 4)])
+        start, end = random_pair(rows, cols, rng.randint(0, 5), seed=k)
+        found = path_BFS_external(start, end, buffer_size=rng.choice([1, 4, 1000]))
+        expected = path_BFS(start, end)
+        assert (found is None) == (expected is None), (start.grid, end.grid)
+        if found:
+            assert len(found) == len(expected) and found[0] == start and found[-1] == end
+            facts = SafetyFacts()
+            assert all(facts.safe(a, b) for a, b in zip(found, found[1:]))
+    assert path_BFS_external(end, start) is None
+    assert len(path_BFS_external(State([[300, 0], [0, 1]]), State([[298, 0], [0, 1]]))) == 3
+    print("[OK] External BFS matches path_BFS on 30 random pairs")
+
+
+# Call a tester function only when this file is executed
+if __name__ == "__main__":
+    tester()
@@ -37,6 +37,7 @@ class GuiConfig:
     cell_size: int = 60  # Pixel size of each board cell
     a_vs_a_delay_ms: int = 1000  # Delay between agent moves (ms)
     human_timeout_seconds: int = 15  # Human turn timeout
+    agent_time_seconds: float = 2.0  # Agent thinking budget per move (Depth is the maximum)
     tick_interval_ms: int = 250  # UI refresh rate for timers
     
     def size_for_mode(self, mode: str) -> int:
@@ -221,7 +222,8 @@ class HingerGUI:
         if not agent:
             return
         # Get agent's move
-        move = agent.move(self.state, mode=self.agent_mode_var.get(), depth=self.depth_var.get())
+        move = agent.move(self.state, mode=self.agent_mode_var.get(), depth=self.depth_var.get(),
+                          time_limit=self.cfg.agent_time_seconds)
         if not move:
             # No legal moves: opponent wins
             self.end_game(f"{self._player_name()} {MSG_NO_MOVES}", self._opponent_name())
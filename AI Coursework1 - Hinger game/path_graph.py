@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Hinger Project
+Coursework 001 for: CMP-6058A Artificial Intelligence
+
+Precomputed Safe-Transition Graph
+Enumerates every state reachable from a start board under is_safe_transition into
+a compact CSR graph with a BFS tree, saves it to disk and answers later path
+queries by lookup on a memory-mapped copy.
+
+@author: B9 (1004411839, 100434969, and 100440712)
+@date: 17/10/2026
+"""
+
+from array import array
+from bisect import bisect_left
+from collections import deque
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+
+from a1_state import CELL_TYPECODES, State
+from a2_path import NodeStore, SafetyFacts, path_BFS
+
+
+# File layout: header, then 8-byte aligned sections in this order:
+# hashes 'Q' (sorted Zobrist hashes), order 'i' (node of each sorted hash),
+# indptr 'q' (n + 1), indices 'i' (edges), parent 'i', depth 'i', boards (n * cells,
+# unsigned, as many bytes per cell as the header says)
+MAGIC = b"HGSG"
+VERSION = 2
+HEADER = struct.Struct("<4sHHIIQQB")  # magic, version, byte order, rows, cols, nodes, edges, cell bytes
+SECTIONS = [("hashes", 'Q'), ("order", 'i'), ("indptr", 'q'), ("indices", 'i'),
+            ("parent", 'i'), ("depth", 'i'), ("boards", None)]
+CELL_CODES = {struct.calcsize(code): code for code in CELL_TYPECODES}
+BYTE_ORDER = {"little": 1, "big": 2}[sys.byteorder]
+
+
+class SafeGraph:
+
+    # State space of one start board in CSR form: node k's safe successors are
+    # indices[indptr[k]:indptr[k + 1]]. Node 0 is the start; parent/depth form a
+    # BFS tree from it, so start -> any node is answered without searching.
+    # Built graphs hold array.array sections, loaded ones hold memoryviews over
+    # a read-only mmap; both are indexed the same way.
+
+    def __init__(self, rows, cols, sections, mapping=None):
+        self.rows, self.cols = rows, cols
+        self.cells = rows * cols
+        for name, _ in SECTIONS:
+            setattr(self, name, sections[name])
+        self._mapping = mapping
+
+    def __len__(self):
+        return len(self.parent)
+
+    @property
+    def num_edges(self):
+        return len(self.indices)
+
+    # Enumerate everything reachable from start (breadth first, so node order is
+    # also BFS order and each node's edges are appended contiguously)
+    @classmethod
+    def build(cls, start):
+        store = NodeStore(start)
+        index = {start.zobrist: store.add(start)}
+        depth = array('i', [0])
+        indptr = array('q', [0])
+        indices = array('i')
+        facts = SafetyFacts()
+        node = 0
+        while node < len(store):
+            state = store.state(node)
+            if not facts.blocked(state):
+                before = facts.regions(state)
+                for move in state.legal_moves():
+                    state.apply(move)
+                    if facts.safe_applied(state, before):
+                        k = index.get(state.zobrist)
+                        if k is None:
+                            k = index[state.zobrist] = store.add(state, node)
+                            depth.append(depth[node] + 1)
+                        indices.append(k)
+                    state.undo(move)
+            indptr.append(len(indices))
+            node += 1
+        hashes = sorted(index)
+        sections = {"hashes": array('Q', hashes), "order": array('i', (index[h] for h in hashes)),
+                    "indptr": indptr, "indices": indices, "parent": store.parents,
+                    "depth": depth, "boards": store.boards}
+        return cls(store.rows, store.cols, sections)
+
+    def save(self, filename):
+        with open(filename, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, BYTE_ORDER, self.rows, self.cols,
+                                len(self), self.num_edges, self.boards.itemsize))
+            f.write(b"\0" * (-HEADER.size % 8))
+            for name, _ in SECTIONS:
+                data = bytes(getattr(self, name))
+                f.write(data)
+                f.write(b"\0" * (-len(data) % 8))
+
+    # Open a saved graph without reading it into memory
+    @classmethod
+    def load(cls, filename):
+        with open(filename, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, byte_order, rows, cols, nodes, edges, cell_bytes = HEADER.unpack_from(mapping)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{filename} is not a version {VERSION} safe-transition graph")
+        if byte_order != BYTE_ORDER:
+            raise ValueError(f"{filename} was written on a machine with a different byte order")
+        if cell_bytes not in CELL_CODES:
+            raise ValueError(f"{filename} has an unknown cell width {cell_bytes}")
+        counts = {"hashes": nodes, "order": nodes, "indptr": nodes + 1, "indices": edges,
+                  "parent": nodes, "depth": nodes, "boards": nodes * rows * cols}
+        view = memoryview(mapping)
+        offset = HEADER.size + (-HEADER.size % 8)
+        sections = {}
+        for name, code in SECTIONS:
+            code = code or CELL_CODES[cell_bytes]
+            size = counts[name] * struct.calcsize(code)
+            sections[name] = view[offset:offset + size].cast(code)
+            offset += size + (-size % 8)
+        return cls(rows, cols, sections, mapping)
+
+    # Release the memory map of a loaded graph
+    def close(self):
+        if self._mapping is not None:
+            for name, _ in SECTIONS:
+                getattr(self, name).release()
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def state(self, k):
+        flat = self.boards[k * self.cells:(k + 1) * self.cells]
+        return State([list(flat[i * self.cols:(i + 1) * self.cols]) for i in range(self.rows)])
+
+    # Node index of a state, or None if it is not in the graph (boards are compared
+    # after the hash lookup, so hash collisions cannot give a wrong node)
+    def index_of(self, state):
+        if (len(state.grid), len(state.grid[0])) != (self.rows, self.cols):
+            return None
+        pos = bisect_left(self.hashes, state.zobrist)
+        if pos == len(self.hashes) or self.hashes[pos] != state.zobrist:
+            return None
+        k = self.order[pos]
+        cells = [cell for row in state.grid for cell in row]
+        return k if list(self.boards[k * self.cells:(k + 1) * self.cells]) == cells else None
+
+    def successors(self, k):
+        return self.indices[self.indptr[k]:self.indptr[k + 1]]
+
+    # Node indices from a to b: read off the BFS tree when a is the start node,
+    # otherwise a BFS over the CSR arrays that never goes deeper than b
+    def node_path(self, a, b):
+        if a == 0:
+            nodes = []
+            while b != -1:
+                nodes.append(b)
+                b = self.parent[b]
+            nodes.reverse()
+            return nodes
+        parent = {a: -1}
+        queue = deque([a])
+        while queue:
+            k = queue.popleft()
+            if k == b:
+                nodes = []
+                while k != -1:
+                    nodes.append(k)
+                    k = parent[k]
+                nodes.reverse()
+                return nodes
+            if self.depth[k] >= self.depth[b]:
+                continue
+            for n in self.successors(k):
+                if n not in parent:
+                    parent[n] = k
+                    queue.append(n)
+        return None
+
+    # Shortest safe path from start to end as States, or None
+    def path(self, start, end):
+        a, b = self.index_of(start), self.index_of(end)
+        if a is None or b is None:
+            return None
+        nodes = self.node_path(a, b)
+        return [self.state(k) for k in nodes] if nodes is not None else None
+
+
+# Function to build, save, reload and query a graph against path_BFS
+def tester():
+    start = State([[2, 1, 2], [1, 2, 1], [2, 1, 2]])
+    graph = SafeGraph.build(start)
+    print(f"Graph from\n{start}\nNodes: {len(graph)} | Edges: {graph.num_edges}")
+
+    rng = random.Random(6058)
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "hinger_3x3.hgsg")
+        graph.save(filename)
+        print(f"Saved {os.path.getsize(filename)} bytes")
+        with SafeGraph.load(filename) as loaded:
+            assert len(loaded) == len(graph) and loaded.num_edges == graph.num_edges
+            for _ in range(100):
+                a = rng.randrange(len(loaded))
+                b = rng.randrange(len(loaded)) if rng.random() < 0.5 else 0
+                s, e = loaded.state(a), loaded.state(b)
+                found = loaded.path(s, e)
+                expected = path_BFS(s, e)
+                assert (found is None) == (expected is None), (s.grid, e.grid)
+                if found:
+                    assert len(found) == len(expected) and found[0] == s and found[-1] == e
+                found = loaded.path(start, e)
+                assert found is not None and len(found) == loaded.depth[b] + 1
+            assert loaded.index_of(State([[3, 3, 3], [3, 3, 3], [3, 3, 3]])) is None
+
+        # Counters above 255 are stored two bytes per cell
+        wide = SafeGraph.build(State([[1, 0, 300]]))
+        wide.save(filename)
+        with SafeGraph.load(filename) as loaded:
+            assert loaded.boards.itemsize == 2 and len(loaded) == len(wide)
+            assert len(loaded.path(State([[1, 0, 300]]), State([[1, 0, 0]]))) == 301
+    print("[OK] 100 queries on the memory-mapped graph match path_BFS")
+
+
+# Call a tester function only when this file is executed
+if __name__ == "__main__":
+    tester()
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Hinger Project
+Coursework 001 for: CMP-6058A Artificial Intelligence
+
+Path Oracle
+Answers "is end reachable from start?" and "how many safe paths lead there?"
+by memoised dynamic programming over the move DAG, without enumerating paths.
+
+@author: B9 (1004411839, 100434969, and 100440712)
+@date: 17/10/2026
+"""
+
+import random
+import time
+
+from a1_state import State
+from a2_path import SafetyFacts, can_reach, iter_safe_paths, path_astar, random_pair
+
+
+class PathOracle:
+
+    # Moves only remove counters, so the safe-transition graph is a DAG and
+    #   paths(s) = [s == end] + sum(paths(m) for every safe move s -> m)
+    # is well defined. Results are memoised per end state, keyed by board
+    # fingerprint (rows, cols, Zobrist hash), and kept between calls, so queries
+    # towards the same end share all the work below their common states. The DP
+    # runs on an explicit stack, so deep boards cannot hit the recursion limit.
+
+    def __init__(self):
+        self.facts = SafetyFacts()
+        self.counts = {}     # end fingerprint -> {state fingerprint: number of safe paths}
+        self.reachable = {}  # end fingerprint -> {state fingerprint: bool}
+        self.hits = 0
+        self.misses = 0
+
+    # Safe successors of state that can still reach end (none once end is reached).
+    # Moves are tested in place and only the safe ones copied.
+    def _children(self, state, end):
+        if state == end or self.facts.blocked(state):
+            return
+        before = self.facts.regions(state)
+        for move in state.legal_moves():
+            state.apply(move)
+            child = state.clone() if can_reach(state, end) and self.facts.safe_applied(state, before) else None
+            state.undo(move)
+            if child is not None:
+                yield child
+
+    # Memo lookup (None if unknown); pass the path counts for the same end to let
+    # earlier count_paths results answer reachability
+    def _lookup(self, memo, key, counts=None):
+        value = memo.get(key)
+        if value is None and counts is not None and key in counts:
+            value = memo[key] = counts[key] > 0
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    # Number of distinct safe paths from start to end (1 if start == end)
+    def count_paths(self, start, end):
+        end_key = end.fingerprint()
+        memo = self.counts.setdefault(end_key, {})
+        key = start.fingerprint()
+        if self._lookup(memo, key) is not None:
+            return memo[key]
+        if not can_reach(start, end):
+            memo[key] = 0
+            return 0
+        # frame: [successor iterator, fingerprint, paths counted so far]
+        frames = [[self._children(start, end), key, int(start == end)]]
+        while frames:
+            frame = frames[-1]
+            child = next(frame[0], None)
+            if child is None:
+                frames.pop()
+                memo[frame[1]] = frame[2]
+                if frames:
+                    frames[-1][2] += frame[2]
+                continue
+            child_key = child.fingerprint()
+            count = self._lookup(memo, child_key)
+            if count is not None:
+                frame[2] += count
+            else:
+                frames.append([self._children(child, end), child_key, int(child == end)])
+        return memo[key]
+
+    # True if some safe path leads from start to end. Stops exploring a state as
+    # soon as one successor reaches end, so it is cheaper than count_paths.
+    def is_reachable(self, start, end):
+        end_key = end.fingerprint()
+        memo = self.reachable.setdefault(end_key, {})
+        counts = self.counts.get(end_key)
+        key = start.fingerprint()
+        if self._lookup(memo, key, counts) is not None:
+            return memo[key]
+        if not can_reach(start, end):
+            memo[key] = False
+            return False
+        # frame: [successor iterator, fingerprint, reached]
+        frames = [[self._children(start, end), key, start == end]]
+        while frames:
+            frame = frames[-1]
+            child = None if frame[2] else next(frame[0], None)
+            if child is None:
+                frames.pop()
+                memo[frame[1]] = frame[2]
+                if frames and frame[2]:
+                    frames[-1][2] = True
+                continue
+            child_key = child.fingerprint()
+            reached = self._lookup(memo, child_key, counts)
+            if reached is not None:
+                frame[2] = reached
+            else:
+                frames.append([self._children(child, end), child_key, child == end])
+        return memo[key]
+
+    def clear(self):
+        self.facts = SafetyFacts()
+        self.counts.clear()
+        self.reachable.clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "states": sum(map(len, self.counts.values())) + sum(map(len, self.reachable.values())),
+                "ends": len(set(self.counts) | set(self.reachable))}
+
+
+# Shared oracle used by the module-level helpers below
+oracle = PathOracle()
+
+
+def is_reachable(start, end):
+    return oracle.is_reachable(start, end)
+
+
+def count_safe_paths(start, end):
+    return oracle.count_paths(start, end)
+
+
+# Function to check the oracle against path enumeration and A*
+def tester():
+    start = State([[1, 0, 0, 0, 0],
+                   [2, 0, 2, 2, 1],
+                   [2, 0, 0, 0, 2],
+                   [0, 0, 1, 2, 1]])
+    end = State([[1, 0, 0, 0, 0],
+                 [2, 0, 2, 2, 1],
+                 [1, 0, 0, 0, 2],
+                 [0, 0, 0, 2, 0]])
+    print("Reachable:", is_reachable(start, end), "| Safe paths:", count_safe_paths(start, end))
+    assert count_safe_paths(start, end) == sum(1 for _ in iter_safe_paths(start, end))
+
+    local = PathOracle()
+    for k in range(60):
+        rows, cols = random.Random(k).choice([(2, 3), (3, 3), (3, 4)])
+        a, b = random_pair(rows, cols, random.Random(k).randint(0, 6), seed=k)
+        if k % 3 == 0:
+            a, b = b, a  # mostly unreachable the other way round
+        count = local.count_paths(a, b)
+        assert count == sum(1 for _ in iter_safe_paths(a, b)), (a.grid, b.grid)
+        assert local.is_reachable(a, b) == (path_astar(a, b) is not None) == (count > 0)
+        assert PathOracle().is_reachable(a, b) == (count > 0)
+    print("[OK] Oracle matches path enumeration and A* on 60 random pairs")
+
+    # Repeated queries towards one end reuse the memo
+    start = State([[2, 1, 2, 1], [1, 2, 1, 2], [2, 1, 2, 1]])
+    end = State([[1, 1, 1, 1], [1, 1, 1, 1], [1, 1, 1, 1]])
+    local = PathOracle()
+    for label in ("First", "Second"):
+        start_time = time.perf_counter()
+        count = local.count_paths(start, end)
+        duration = time.perf_counter() - start_time
+        print(f"{label} query | Paths: {count} | Time: {duration:.4f}s | {local.stats()}")
+
+
+# Call a tester function only when this file is executed
+if __name__ == "__main__":
+    tester()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Hinger Project
+Coursework 001 for: CMP-6058A Artificial Intelligence
+
+Shared Boards
+Places a batch of equally sized boards in one multiprocessing.shared_memory
+block, so pool workers can read them by name without pickling or copying.
+
+@author: B9 (1004411839, 100434969, and 100440712)
+@date: 17/10/2026
+"""
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import random
+import struct
+import time
+
+from a1_state import CELL_TYPECODES, State, cell_typecode
+
+
+# Block layout: header, then from DATA_OFFSET count * rows * cols unsigned cells
+# of the header's width (one byte unless some counter needs more), board k
+# row-major from cell k * rows * cols
+MAGIC = b"HGSB"
+HEADER = struct.Struct("<4sIHHB")  # magic, count, rows, cols, cell bytes
+DATA_OFFSET = HEADER.size + (-HEADER.size % 8)
+CELL_CODES = {struct.calcsize(code): code for code in CELL_TYPECODES}
+
+
+class SharedBoards:
+
+    # A batch of boards in shared memory. The creating process owns the block
+    # and unlinks it on close; workers attach by name and only detach. board(k)
+    # is a zero-copy memoryview of one board; state(k) decodes it into a State.
+
+    def __init__(self, shm, owner):
+        magic, self.count, self.rows, self.cols, cell_bytes = HEADER.unpack_from(shm.buf)
+        if magic != MAGIC or cell_bytes not in CELL_CODES:
+            raise ValueError(f"Shared memory block {shm.name} does not hold boards")
+        self.cells = self.rows * self.cols
+        self._shm = shm
+        self._owner = owner
+        size = self.count * self.cells * cell_bytes
+        self._view = shm.buf[DATA_OFFSET:DATA_OFFSET + size].cast(CELL_CODES[cell_bytes])
+
+    # Copy states into a new shared block
+    @classmethod
+    def create(cls, states):
+        states = list(states)
+        rows, cols = len(states[0].grid), len(states[0].grid[0])
+        for k, state in enumerate(states):
+            if (len(state.grid), len(state.grid[0])) != (rows, cols):
+                raise ValueError(f"Board {k} is not {rows}x{cols}")
+        code = cell_typecode(max((cell for state in states for row in state.grid for cell in row), default=0))
+        size = len(states) * rows * cols * struct.calcsize(code)
+        shm = shared_memory.SharedMemory(create=True, size=DATA_OFFSET + max(1, size))
+        HEADER.pack_into(shm.buf, 0, MAGIC, len(states), rows, cols, struct.calcsize(code))
+        for k, state in enumerate(states):
+            data = array(code, [cell for row in state.grid for cell in row]).tobytes()
+            offset = DATA_OFFSET + k * len(data)
+            shm.buf[offset:offset + len(data)] = data
+        return cls(shm, owner=True)
+
+    # Open a block created in another process
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def __len__(self):
+        return self.count
+
+    def board(self, k):
+        return self._view[k * self.cells:(k + 1) * self.cells]
+
+    def state(self, k, factory=State):
+        flat = self.board(k)
+        return factory([flat[i * self.cols:(i + 1) * self.cols].tolist() for i in range(self.rows)])
+
+    def close(self):
+        if self._shm is None:
+            return
+        self._view.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Worker: region counts of boards start..stop of a shared batch
+def regions_in_range(name, start, stop):
+    with SharedBoards.attach(name) as boards:
+        return [boards.state(k).numRegions() for k in range(start, stop)]
+
+
+# Region counts of every board in a shared batch, split over a process pool.
+# Only the block name and index ranges are sent to the workers.
+def parallel_regions(boards, processes=None, chunk=256):
+    ranges = [(k, min(k + chunk, len(boards))) for k in range(0, len(boards), chunk)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(regions_in_range, boards.name, start, stop) for start, stop in ranges]
+        return [count for future in futures for count in future.result()]
+
+
+# Function to compare pool workers reading a shared batch with a local loop
+def tester():
+    rng = random.Random(6058)
+    states = [State([[rng.choice([0, 0, 1, 1, 2]) for _ in range(8)] for _ in range(8)])
+              for _ in range(2000)]
+    with SharedBoards.create(states) as boards:
+        assert len(boards) == len(states) and boards.state(7) == states[7]
+        print(f"Shared block {boards.name}: {len(boards)} boards of {boards.rows}x{boards.cols}")
+
+        start_time = time.perf_counter()
+        expected = [state.numRegions() for state in states]
+        local_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        found = parallel_regions(boards, processes=2)
+        pool_time = time.perf_counter() - start_time
+        assert found == expected
+    print(f"[OK] Pool workers match the local loop | Local: {local_time:.3f}s | Pool: {pool_time:.3f}s")
+
+    wide = [State([[300, 0, 1]]), State([[1, 0, 70000]])]
+    with SharedBoards.create(wide) as boards:
+        assert [boards.state(k) for k in range(len(boards))] == wide
+        assert parallel_regions(boards, processes=1) == [2, 2]
+
+
+# Call a tester function only when this file is executed
+if __name__ == "__main__":
+    tester()
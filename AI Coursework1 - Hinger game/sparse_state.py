@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Hinger Project
+Coursework 001 for: CMP-6058A Artificial Intelligence
+
+Sparse State
+State variant for huge, mostly empty boards: only non-zero cells are stored,
+so moves, regions and hingers cost O(active cells) instead of O(rows * cols).
+
+@author: B9 (1004411839, 100434969, and 100440712)
+@date: 17/10/2026
+"""
+
+from array import array
+import pickle
+import random
+import struct
+import time
+
+from a1_state import (CELL_WIDTHS, State, GridView, NEIGHBOURS, _little_endian, cell_typecode,
+                      find_hingers, zobrist_key)
+
+
+class SparseState(State):
+
+    # Drop-in replacement for State that keeps a dict {(i, j): counter} of the
+    # active cells plus the board dimensions. Hashes match the dense State, so
+    # sparse and dense states with the same contents are equal.
+
+    def __init__(self, grid=None, size=5):
+        if grid is None:
+            grid = [[0 for _ in range(size)] for _ in range(size)]
+        self._load(grid)
+
+    # Build a sparse state straight from its active cells, without a dense grid
+    @classmethod
+    def from_cells(cls, cells, rows, cols):
+        new_state = cls.__new__(cls)
+        new_state.rows, new_state.cols = rows, cols
+        new_state.cells = {pos: value for pos, value in cells.items() if value > 0}
+        new_state.rehash()
+        return new_state
+
+    # (Re)build the cell dict from any nested grid (list of lists or GridView)
+    def _load(self, grid):
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if self.rows else 0
+        self.cells = {}
+        for i, row in enumerate(grid):
+            for j, cell in enumerate(row):
+                if cell > 0:
+                    self.cells[(i, j)] = cell
+        self.rehash()
+
+    # Expose the board through the usual .grid interface
+    @property
+    def grid(self):
+        return GridView(self)
+
+    @grid.setter
+    def grid(self, value):
+        self._load(value)
+
+    def _get_cell(self, i, j):
+        return self.cells.get((i, j), 0)
+
+    def _set_cell(self, i, j, value):
+        old = self.cells.get((i, j), 0)
+        self.zobrist ^= zobrist_key(i, j, old) ^ zobrist_key(i, j, value)
+        self.total += value - old
+        if value > 0:
+            self.cells[(i, j)] = value
+        else:
+            self.cells.pop((i, j), None)
+
+    def rehash(self):
+        h = 0
+        for (i, j), value in self.cells.items():
+            h ^= zobrist_key(i, j, value)
+        self.zobrist = h
+        self.total = sum(self.cells.values())
+        return h
+
+    def __eq__(self, other):
+        if isinstance(other, SparseState):
+            return (self.zobrist == other.zobrist and self.cells == other.cells
+                    and (self.rows, self.cols) == (other.rows, other.cols))
+        return super().__eq__(other)
+
+    __hash__ = State.__hash__
+
+    def clone(self):
+        new_state = SparseState.__new__(SparseState)
+        new_state.rows, new_state.cols = self.rows, self.cols
+        new_state.cells = dict(self.cells)
+        new_state.zobrist = self.zobrist
+        new_state.total = self.total
+        return new_state
+
+    def decrement(self, i, j):
+        self._set_cell(i, j, self.cells[(i, j)] - 1)
+
+    def increment(self, i, j):
+        self._set_cell(i, j, self.cells.get((i, j), 0) + 1)
+
+    # Same move order as State.moves (row-major over non-zero cells)
+    def moves(self):
+        for i, j in sorted(self.cells):
+            new_state = self.clone()
+            new_state.decrement(i, j)
+            yield new_state
+
+    # Explicit-stack flood fill over the active cells only
+    def _count_regions(self):
+        unvisited = set(self.cells)
+        regions = 0
+        while unvisited:
+            stack = [unvisited.pop()]
+            regions += 1
+            while stack:
+                i, j = stack.pop()
+                for di, dj in NEIGHBOURS:
+                    nxt = (i + di, j + dj)
+                    if nxt in unvisited:
+                        unvisited.remove(nxt)
+                        stack.append(nxt)
+        return regions
+
+    def _find_hingers(self):
+        return find_hingers(self.cells)
+
+    def get_active_cells(self):
+        return sorted(self.cells)
+
+    def is_empty(self):
+        return not self.cells
+
+    # Plain list-of-lists State with the same contents
+    def to_state(self):
+        return State(self.grid)
+
+    # Sparse bytes form: SPARSE_HEADER (rows, cols, active cells, bytes per
+    # counter), then the active cells' (i, j) as uint32 pairs and their counters
+    # as unsigned integers of the width cell_typecode picks, all little-endian.
+    # Used by pickling too, so huge boards stay small.
+    def to_bytes(self):
+        cells = sorted(self.cells.items())
+        positions = _little_endian(array('I', [k for pos, _ in cells for k in pos]))
+        values = [value for _, value in cells]
+        values = _little_endian(array(cell_typecode(max(values, default=0)), values))
+        return (SPARSE_HEADER.pack(self.rows, self.cols, len(cells), values.itemsize)
+                + positions.tobytes() + values.tobytes())
+
+    @classmethod
+    def from_bytes(cls, data):
+        rows, cols, n, width = SPARSE_HEADER.unpack_from(data)
+        if width not in CELL_WIDTHS:
+            raise ValueError(f"Unknown counter width {width}")
+        positions, values = array('I'), array(CELL_WIDTHS[width])
+        offset = SPARSE_HEADER.size
+        positions.frombytes(data[offset:offset + 8 * n])
+        values.frombytes(data[offset + 8 * n:offset + (8 + width) * n])
+        _little_endian(positions)
+        _little_endian(values)
+        cells = {(positions[2 * k], positions[2 * k + 1]): values[k] for k in range(n)}
+        return cls.from_cells(cells, rows, cols)
+
+
+SPARSE_HEADER = struct.Struct("<IIIB")
+
+
+# Function to check SparseState against State and time a huge sparse board
+def tester():
+    rng = random.Random(6058)
+    for _ in range(200):
+        rows, cols = rng.randint(1, 7), rng.randint(1, 7)
+        g = [[rng.choice([0, 0, 0, 1, 1, 2]) for _ in range(cols)] for _ in range(rows)]
+        dense, sparse = State(g), SparseState(g)
+        assert sparse.numRegions() == dense.numRegions()
+        assert sparse.hingers() == dense.hingers()
+        assert sparse.get_active_cells() == dense.get_active_cells()
+        assert sparse.is_empty() == dense.is_empty()
+        assert list(sparse.moves()) == list(dense.moves())
+        assert sparse == dense and sparse.to_state() == dense
+        assert pickle.loads(pickle.dumps(sparse)) == sparse
+    wide = SparseState.from_cells({(0, 0): 70000, (3, 90000): 1}, 5, 100000)
+    assert pickle.loads(pickle.dumps(wide)) == wide
+    print("[OK] SparseState matches State on 200 random boards")
+
+    # 100000 x 100000 board with a few thousand counters
+    cells = {(rng.randrange(100000), rng.randrange(100000)): rng.choice([1, 2]) for _ in range(5000)}
+    for i in range(200):
+        cells[(50000, 50000 + i)] = 1  # one long line of hingers
+    huge = SparseState.from_cells(cells, 100000, 100000)
+    start_time = time.perf_counter()
+    regions, hingers = huge.numRegions(), huge.numHingers()
+    duration = time.perf_counter() - start_time
+    print(f"100000x100000 sparse | Active: {len(huge.cells)} | Regions: {regions} | "
+          f"Hingers: {hingers} | Time: {duration:.3f}s")
+    restored = pickle.loads(pickle.dumps(huge))
+    assert restored == huge and restored.total == huge.total
+    print("Pickled:", len(pickle.dumps(huge)), "bytes")
+
+
+# Call a tester function only when this file is executed
+if __name__ == "__main__":
+    tester()
@@ -26,19 +26,12 @@ def is_legal(state: State, r: int, c: int) -> bool:
 
 def is_hinger_now(state: State, r: int, c: int) -> bool:
     # Check if cell at (r,c) is a hinger (value=1 and removal increases regions)
-    if state.grid[r][c] != 1:
-        return False
-    regions_before = state.numRegions()
-    # Clone state and test removal
-    test = state.clone()
-    test.grid[r][c] = 0
-    regions_after = test.numRegions()
-    return regions_after > regions_before
+    return (r, c) in state.hingers()
 
 
 def apply_move(state: State, r: int, c: int) -> None:
     # Apply move by decrementing cell at (r,c) by 1. Mutates state in place
-    state.grid[r][c] -= 1
+    state.decrement(r, c)
 
 
 def board_cleared(state: State) -> bool: